@@ -9,12 +9,18 @@ import os
 import random
 import re
 import sys
-from dataclasses import dataclass, field, asdict
+import textwrap
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 
 _cert_name = ""  # set by main(); used by print_header()
 
+_SEP_DELETE = str.maketrans('', '', ' \t\n\r\f\v,/')  # separators users type between answer letters
+_SAVE_EVERY = 5  # answers between progress writes; quitting or finishing always saves
+
 
 def cert_name_from_path(path: Path) -> str:
     """'saa-c03_questions.json' → 'SAA-C03'"""
@@ -26,7 +32,7 @@ def progress_path_from_questions(questions_path: Path) -> Path:
     return questions_path.parent / f".{cert_id}_progress.json"
 
 
-@dataclass
+@dataclass(slots=True)
 class Question:
     """Represents a single quiz question."""
     number: int
@@ -35,9 +41,22 @@ class Question:
     correct_answer: str  # 'A', 'B', 'C', or 'D'
     explanation: str
     domain: str = ""
-
-
-@dataclass
+    expected_answers: int = field(init=False, default=1)  # 2 for 'Choose two'
+    # Derived once here so display code doesn't re-sort/re-build per question
+    options_sorted: tuple = field(init=False, default=(), repr=False)  # ((letter, text), ...)
+    correct_set: frozenset = field(init=False, default=frozenset(), repr=False)
+    domain_set: frozenset = field(init=False, default=frozenset(), repr=False)  # domain split on ', '
+
+    def __post_init__(self):
+        if 'choose two' in self.text.lower():
+            self.expected_answers = 2
+        self.options_sorted = tuple(sorted(self.options.items()))
+        self.correct_set = frozenset(self.correct_answer)
+        if self.domain:
+            self.domain_set = frozenset(self.domain.split(', '))
+
+
+@dataclass(slots=True)
 class Progress:
     """Tracks user progress across sessions."""
     total_questions: int = 0
@@ -46,8 +65,31 @@ class Progress:
     current_session_correct: int = 0
     current_session_total: int = 0
     last_question_index: int = 0
-    question_stats: dict = field(default_factory=dict)
+    question_stats: dict = field(default_factory=dict)  # keyed by question number
     last_session: str = ""
+    # Numbers of questions ever answered wrong; kept current by record_answer()
+    weak_numbers: set = field(init=False, default_factory=set, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.weak_numbers = {n for n, s in self.question_stats.items()
+                             if s.get('seen', 0) > s.get('correct', 0)}
+
+    def to_dict(self) -> dict:
+        """Plain dict for JSON; avoids asdict()'s deep copy of question_stats.
+
+        JSON object keys must be strings, so question numbers are converted
+        here and back to ints in load_progress().
+        """
+        return {
+            'total_questions': self.total_questions,
+            'questions_answered': self.questions_answered,
+            'correct_answers': self.correct_answers,
+            'current_session_correct': self.current_session_correct,
+            'current_session_total': self.current_session_total,
+            'last_question_index': self.last_question_index,
+            'question_stats': {str(k): v for k, v in self.question_stats.items()},
+            'last_session': self.last_session,
+        }
 
 
 class Colors:
@@ -66,80 +108,166 @@ def colorize(text: str, color: str) -> str:
     return f"{color}{text}{Colors.RESET}"
 
 
+# Fixed decorations, colorized once instead of on every screen
+_HEADER_TOP = colorize("╔════════════════════════════════════════════════════════════╗", Colors.CYAN)
+_HEADER_TITLE = colorize("║           AWS Certification Quiz Tool                      ║", Colors.CYAN)
+_HEADER_BOTTOM = colorize("╚════════════════════════════════════════════════════════════╝", Colors.CYAN)
+_RULE_DIM = colorize("─" * 62, Colors.DIM)
+_RULE_GREEN = colorize("═" * 62, Colors.GREEN)
+_RULE_RED = colorize("═" * 62, Colors.RED)
+
+
 def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    # Escape sequence instead of spawning `clear`/`cls` on every screen
+    sys.stdout.write('\033[2J\033[H')
+
+
+DOMAIN_KEYWORDS = {
+    'Compute': ['EC2', 'Lambda', 'ECS', 'EKS', 'Fargate', 'Auto Scaling', 'Elastic Beanstalk'],
+    'Storage': ['S3', 'EBS', 'EFS', 'FSx', 'Storage Gateway', 'Snowball', 'Glacier'],
+    'Database': ['RDS', 'DynamoDB', 'Aurora', 'ElastiCache', 'Redshift', 'DocumentDB'],
+    'Networking': ['VPC', 'CloudFront', 'Route 53', 'Direct Connect', 'VPN', 'Transit Gateway',
+                   'API Gateway', 'Load Balancer', 'ALB', 'NLB'],
+    'Security': ['IAM', 'KMS', 'Secrets Manager', 'WAF', 'Shield', 'GuardDuty',
+                 'Certificate Manager', 'ACM', 'Security Group'],
+    'Analytics': ['Athena', 'Kinesis', 'EMR', 'Glue', 'QuickSight', 'OpenSearch'],
+    'Integration': ['SQS', 'SNS', 'EventBridge', 'Step Functions'],
+    'Management': ['CloudWatch', 'CloudTrail', 'Config', 'Systems Manager', 'Organizations'],
+}
+
+_KEYWORD_TO_DOMAIN = {kw.upper(): domain
+                      for domain, keywords in DOMAIN_KEYWORDS.items() for kw in keywords}
+# One pass over the text finds every keyword; the lookahead makes matches
+# zero-width so overlapping keywords are all reported, like the old `in` checks.
+_KEYWORD_RE = re.compile('(?=(' + '|'.join(
+    re.escape(kw) for kw in sorted(_KEYWORD_TO_DOMAIN, key=len, reverse=True)) + '))')
 
 
 def extract_domain(question_text: str) -> str:
     """Try to extract/infer the AWS domain from question text."""
-    domains = {
-        'Compute': ['EC2', 'Lambda', 'ECS', 'EKS', 'Fargate', 'Auto Scaling', 'Elastic Beanstalk'],
-        'Storage': ['S3', 'EBS', 'EFS', 'FSx', 'Storage Gateway', 'Snowball', 'Glacier'],
-        'Database': ['RDS', 'DynamoDB', 'Aurora', 'ElastiCache', 'Redshift', 'DocumentDB'],
-        'Networking': ['VPC', 'CloudFront', 'Route 53', 'Direct Connect', 'VPN', 'Transit Gateway',
-                       'API Gateway', 'Load Balancer', 'ALB', 'NLB'],
-        'Security': ['IAM', 'KMS', 'Secrets Manager', 'WAF', 'Shield', 'GuardDuty',
-                     'Certificate Manager', 'ACM', 'Security Group'],
-        'Analytics': ['Athena', 'Kinesis', 'EMR', 'Glue', 'QuickSight', 'OpenSearch'],
-        'Integration': ['SQS', 'SNS', 'EventBridge', 'Step Functions'],
-        'Management': ['CloudWatch', 'CloudTrail', 'Config', 'Systems Manager', 'Organizations'],
-    }
-
-    text_upper = question_text.upper()
-    matched = []
-
-    for domain, keywords in domains.items():
-        for keyword in keywords:
-            if keyword.upper() in text_upper:
-                matched.append(domain)
-                break
+    hits = {_KEYWORD_TO_DOMAIN[kw] for kw in _KEYWORD_RE.findall(question_text.upper())}
+    matched = [domain for domain in DOMAIN_KEYWORDS if domain in hits]
 
     return ', '.join(matched[:2]) if matched else 'General'
 
 
 def load_questions(json_path: str) -> list:
     """Load questions from JSON file."""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Decode straight from bytes: json.loads() detects UTF-8 itself, which
+    # skips the text-mode decoding layer for large question banks.
+    with open(json_path, 'rb') as f:
+        data = json.loads(f.read())
 
-    questions = []
-    for q in data:
-        questions.append(Question(
+    return [
+        Question(
             number=q['number'],
             text=q['question'],
             options=q['options'],
             correct_answer=q['correct_answer'],
             explanation=q.get('explanation', ''),
             domain=extract_domain(q['question'])
-        ))
+        )
+        for q in data
+    ]
+
 
-    return questions
+def delta_log_path(progress_file: str) -> str:
+    """Sibling file holding the answers logged since the last full save."""
+    return os.path.splitext(progress_file)[0] + '.delta.jsonl'
 
 
 def load_progress(progress_file: str) -> Progress:
-    if os.path.exists(progress_file):
+    try:
+        with open(progress_file, 'rb') as f:
+            data = json.loads(f.read())
+        data['question_stats'] = {int(k): v for k, v
+                                  in data.get('question_stats', {}).items()}
+        progress = Progress(**data)
+    except (FileNotFoundError, json.JSONDecodeError, TypeError, ValueError, AttributeError):
+        progress = Progress()
+    _replay_delta_log(progress, delta_log_path(progress_file))
+    return progress
+
+
+def _replay_delta_log(progress: Progress, delta_file: str):
+    """Apply answers appended by append_delta() on top of the last full save."""
+    try:
+        with open(delta_file, 'rb') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return
+    for line in lines:
         try:
-            with open(progress_file, 'r') as f:
-                data = json.load(f)
-                return Progress(**data)
-        except (json.JSONDecodeError, TypeError):
-            pass
-    return Progress()
+            entry = json.loads(line)
+            fields = (entry['q'], entry['correct'], entry['index'],
+                      entry['session_correct'], entry['session_total'], entry['ts'])
+        except (json.JSONDecodeError, KeyError, TypeError):
+            continue  # torn or malformed line, e.g. from a crash mid-append
+        number, is_correct, index, session_correct, session_total, ts = fields
+        record_answer(progress, number, is_correct, index)
+        progress.current_session_correct = session_correct
+        progress.current_session_total = session_total
+        progress.last_session = ts
+
+
+def delta_line(progress: Progress, number: int, is_correct: bool) -> str:
+    """Format the delta-log line for an answer already applied with record_answer().
+
+    The session counters are logged as they stand, so replay also restores
+    a session reset that was never saved. The timestamp is progress.last_session,
+    which the caller sets.
+    """
+    entry = {
+        'q': number,
+        'correct': is_correct,
+        'index': progress.last_question_index,
+        'session_correct': progress.current_session_correct,
+        'session_total': progress.current_session_total,
+        'ts': progress.last_session,
+    }
+    return json.dumps(entry) + '\n'
+
+
+def append_delta(progress_file: str, lines: str):
+    """Append delta_line() output to the progress file's delta log.
+
+    Costs a few short lines instead of rewriting the whole progress file; the
+    log is folded in by load_progress() and cleared by the next save_progress().
+    """
+    with open(delta_log_path(progress_file), 'a') as f:
+        f.write(lines)
 
 
 def save_progress(progress: Progress, progress_file: str):
     progress.last_session = datetime.now().isoformat()
-    with open(progress_file, 'w') as f:
-        json.dump(asdict(progress), f, indent=2)
+    # json.dumps without indent runs in the C encoder; json.dump/indent don't
+    data = json.dumps(progress.to_dict())
+    # Write a temp file and rename it over the old one, so a crash mid-write
+    # can't leave a truncated progress file behind.
+    tmp_file = f"{progress_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, 'w') as f:
+            f.write(data)
+        os.replace(tmp_file, progress_file)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except FileNotFoundError:
+            pass
+        raise
+    try:
+        os.remove(delta_log_path(progress_file))
+    except FileNotFoundError:
+        pass
 
 
 def print_header():
-    print(colorize("╔════════════════════════════════════════════════════════════╗", Colors.CYAN))
-    print(colorize("║           AWS Certification Quiz Tool                      ║", Colors.CYAN))
+    print(_HEADER_TOP)
+    print(_HEADER_TITLE)
     if _cert_name:
         line = f"  {_cert_name}"
         print(colorize(f"║{line.ljust(60)}║", Colors.CYAN))
-    print(colorize("╚════════════════════════════════════════════════════════════╝", Colors.CYAN))
+    print(_HEADER_BOTTOM)
     print()
 
 
@@ -149,13 +277,13 @@ def print_stats(progress: Progress, total: int):
     overall_pct = (progress.correct_answers / progress.questions_answered * 100
                    if progress.questions_answered > 0 else 0)
 
-    print(colorize("─" * 62, Colors.DIM))
+    print(_RULE_DIM)
     print(f"  Session: {colorize(f'{progress.current_session_correct}/{progress.current_session_total}', Colors.YELLOW)} "
           f"({session_pct:.0f}%)  │  "
           f"Overall: {colorize(f'{progress.correct_answers}/{progress.questions_answered}', Colors.BLUE)} "
           f"({overall_pct:.0f}%)  │  "
           f"Total: {total} questions")
-    print(colorize("─" * 62, Colors.DIM))
+    print(_RULE_DIM)
     print()
 
 
@@ -169,23 +297,21 @@ def display_question(question: Question, index: int, total: int):
     print()
 
     # Display options
-    for letter in sorted(question.options.keys()):
-        print(f"  {colorize(letter, Colors.YELLOW)}. {question.options[letter]}")
+    for letter, text in question.options_sorted:
+        print(f"  {colorize(letter, Colors.YELLOW)}. {text}")
     print()
 
 
 def is_multi_select(question: Question) -> int:
     """Return the number of expected answers (2 for 'Choose two', else 1)."""
-    if 'choose two' in question.text.lower():
-        return 2
-    return 1
+    return question.expected_answers
 
 
 def display_result(question: Question, user_answer: str, is_correct: bool):
     print()
-    print(colorize("═" * 62, Colors.GREEN if is_correct else Colors.RED))
+    print(_RULE_GREEN if is_correct else _RULE_RED)
 
-    multi = is_multi_select(question)
+    multi = question.expected_answers
 
     if is_correct:
         print(colorize("✓ CORRECT!", Colors.GREEN + Colors.BOLD))
@@ -212,47 +338,61 @@ def display_result(question: Question, user_answer: str, is_correct: bool):
     if question.explanation:
         print()
         print(colorize("EXPLANATION:", Colors.BLUE + Colors.BOLD))
-        # Word wrap the explanation
-        words = question.explanation.split()
-        line = "  "
-        for word in words:
-            if len(line) + len(word) > 70:
-                print(colorize(line, Colors.DIM))
-                line = "  "
-            line += word + " "
-        if line.strip():
-            print(colorize(line, Colors.DIM))
-
-    print(colorize("═" * 62, Colors.GREEN if is_correct else Colors.RED))
+        wrapped = textwrap.fill(question.explanation, width=70,
+                                initial_indent="  ", subsequent_indent="  ")
+        print(colorize(wrapped, Colors.DIM))
+
+    print(_RULE_GREEN if is_correct else _RULE_RED)
     print()
 
 
-def get_domains(questions: list) -> list:
-    domains = set()
+def build_domain_index(questions: list) -> dict:
+    """Map each domain to its questions (in original order) in a single pass."""
+    index = {}
     for q in questions:
-        if q.domain:
-            for d in q.domain.split(', '):
-                domains.add(d)
-    return sorted(domains)
+        for d in q.domain_set:
+            index.setdefault(d, []).append(q)
+    return index
 
 
-def filter_by_domain(questions: list, domain: str) -> list:
+def get_domains(domain_index: dict) -> list:
+    return sorted(domain_index)
+
+
+def filter_by_domain(questions: list, domain_index: dict, domain: str) -> list:
     if domain.lower() == 'all':
-        return questions
-    return [q for q in questions if domain.lower() in q.domain.lower()]
+        return list(questions)
+    return list(domain_index.get(domain, []))
+
+
+def get_domain_stats(questions: list, progress: Progress) -> dict:
+    """Return {domain: {'total', 'attempted', 'correct'}} sorted by domain, in one pass."""
+    per_domain = defaultdict(lambda: {'total': 0, 'attempted': 0, 'correct': 0})
+    question_stats = progress.question_stats
+    for q in questions:
+        if not q.domain_set:
+            continue
+        stats = question_stats.get(q.number)
+        for d in q.domain_set:
+            counts = per_domain[d]
+            counts['total'] += 1
+            if stats is not None:
+                counts['attempted'] += 1
+                counts['correct'] += stats.get('correct', 0)
+    return {d: per_domain[d] for d in sorted(per_domain)}
 
 
 def get_weak_spots(questions: list, progress: Progress) -> list:
     """Return questions the user has gotten wrong, sorted by worst accuracy."""
-    weak = []
+    question_stats = progress.question_stats
+    weak = []  # (accuracy, question), so each stats entry is looked up once
     for q in questions:
-        stats = progress.question_stats.get(str(q.number))
+        stats = question_stats.get(q.number)
         if stats and stats['seen'] > stats['correct']:
-            weak.append(q)
-    # Sort by accuracy ascending (worst first)
-    weak.sort(key=lambda q: progress.question_stats[str(q.number)]['correct']
-              / progress.question_stats[str(q.number)]['seen'])
-    return weak
+            weak.append((stats['correct'] / stats['seen'], q))
+    # Sort by accuracy ascending (worst first); stable, so ties keep question order
+    weak.sort(key=itemgetter(0))
+    return [q for _, q in weak]
 
 
 def show_menu(questions: list, progress: Progress) -> str:
@@ -278,8 +418,8 @@ def show_menu(questions: list, progress: Progress) -> str:
     return input(colorize("Choose option: ", Colors.YELLOW)).strip()
 
 
-def show_domain_menu(questions: list):
-    domains = get_domains(questions)
+def show_domain_menu(domain_index: dict):
+    domains = get_domains(domain_index)
 
     clear_screen()
     print_header()
@@ -287,8 +427,7 @@ def show_domain_menu(questions: list):
     print()
     print("  0. All domains")
     for i, domain in enumerate(domains, 1):
-        count = len([q for q in questions if domain in q.domain])
-        print(f"  {i}. {domain} ({count} questions)")
+        print(f"  {i}. {domain} ({len(domain_index[domain])} questions)")
     print()
     print("  b. Back to menu")
     print()
@@ -314,7 +453,7 @@ def show_statistics(questions: list, progress: Progress):
     clear_screen()
     print_header()
     print(colorize("STATISTICS", Colors.BOLD))
-    print(colorize("─" * 62, Colors.DIM))
+    print(_RULE_DIM)
     print()
 
     print(f"Total questions available: {len(questions)}")
@@ -327,13 +466,9 @@ def show_statistics(questions: list, progress: Progress):
 
     print()
     print(colorize("BY DOMAIN:", Colors.BOLD))
-    domains = get_domains(questions)
-    for domain in domains:
-        domain_qs = [q for q in questions if domain in q.domain]
-        attempted = sum(1 for q in domain_qs if str(q.number) in progress.question_stats)
-        correct = sum(progress.question_stats.get(str(q.number), {}).get('correct', 0)
-                     for q in domain_qs)
-        print(f"  {domain}: {attempted}/{len(domain_qs)} attempted, {correct} correct")
+    for domain, counts in get_domain_stats(questions, progress).items():
+        print(f"  {domain}: {counts['attempted']}/{counts['total']} attempted, "
+              f"{counts['correct']} correct")
 
     print()
     print(colorize("Last session: ", Colors.DIM) + (progress.last_session or "Never"))
@@ -341,6 +476,23 @@ def show_statistics(questions: list, progress: Progress):
     input(colorize("Press Enter to continue...", Colors.DIM))
 
 
+def record_answer(progress: Progress, number: int, is_correct: bool, index: int):
+    """Update session, overall and per-question counters for one answer."""
+    progress.current_session_total += 1
+    progress.questions_answered += 1
+    progress.last_question_index = index
+
+    stats = progress.question_stats.setdefault(number, {'seen': 0, 'correct': 0})
+    stats['seen'] += 1
+
+    if is_correct:
+        progress.current_session_correct += 1
+        progress.correct_answers += 1
+        stats['correct'] += 1
+    else:
+        progress.weak_numbers.add(number)
+
+
 def _answer_question(question: Question, progress: Progress, progress_file: str,
                      index: int) -> bool:
     """Prompt the user for an answer to one question. Updates progress in place.
@@ -348,8 +500,8 @@ def _answer_question(question: Question, progress: Progress, progress_file: str,
     Returns True to continue to the next question, False if the user quit.
     """
     valid_options = set(question.options.keys())
-    valid_options_str = '/'.join(sorted(valid_options))
-    multi = is_multi_select(question)
+    valid_options_str = '/'.join(letter for letter, _ in question.options_sorted)
+    multi = question.expected_answers
 
     if multi > 1:
         print(colorize(f"Select {multi} answers (e.g. AB), 'q' to quit, 's' to skip:", Colors.DIM))
@@ -368,59 +520,29 @@ def _answer_question(question: Question, progress: Progress, progress_file: str,
             return True
 
         # Normalize input: remove separators like commas, spaces
-        cleaned = re.sub(r'[\s,/]+', '', user_input)
+        cleaned = user_input.translate(_SEP_DELETE)
 
         if multi > 1:
             # Multi-select: need exactly `multi` unique valid letters
             letters = list(dict.fromkeys(cleaned))  # unique, preserve order
-            if len(letters) == multi and all(l in valid_options for l in letters):
+            if len(letters) == multi and valid_options.issuperset(letters):
                 user_answer = ''.join(letters)
-                is_correct = set(user_answer) == set(question.correct_answer)
-
-                progress.current_session_total += 1
-                progress.questions_answered += 1
-                progress.last_question_index = index
-
-                q_key = str(question.number)
-                if q_key not in progress.question_stats:
-                    progress.question_stats[q_key] = {'seen': 0, 'correct': 0}
-                progress.question_stats[q_key]['seen'] += 1
-
-                if is_correct:
-                    progress.current_session_correct += 1
-                    progress.correct_answers += 1
-                    progress.question_stats[q_key]['correct'] += 1
-
-                display_result(question, user_answer, is_correct)
-                save_progress(progress, progress_file)
-                input(colorize("Press Enter for next question...", Colors.DIM))
-                return True
-            else:
-                print(colorize(f"Please enter exactly {multi} valid options (e.g. AB)", Colors.RED))
+                is_correct = set(letters) == question.correct_set
+                break
+            print(colorize(f"Please enter exactly {multi} valid options (e.g. AB)", Colors.RED))
+        elif cleaned in valid_options:
+            user_answer = cleaned
+            is_correct = cleaned == question.correct_answer
+            break
         else:
-            if cleaned in valid_options:
-                is_correct = cleaned == question.correct_answer
-
-                progress.current_session_total += 1
-                progress.questions_answered += 1
-                progress.last_question_index = index
-
-                q_key = str(question.number)
-                if q_key not in progress.question_stats:
-                    progress.question_stats[q_key] = {'seen': 0, 'correct': 0}
-                progress.question_stats[q_key]['seen'] += 1
-
-                if is_correct:
-                    progress.current_session_correct += 1
-                    progress.correct_answers += 1
-                    progress.question_stats[q_key]['correct'] += 1
+            print(colorize(f"Invalid option. Please enter {valid_options_str}", Colors.RED))
 
-                display_result(question, cleaned, is_correct)
-                save_progress(progress, progress_file)
-                input(colorize("Press Enter for next question...", Colors.DIM))
-                return True
-            else:
-                print(colorize(f"Invalid option. Please enter {valid_options_str}", Colors.RED))
+    record_answer(progress, question.number, is_correct, index)
+    display_result(question, user_answer, is_correct)
+    if progress.current_session_total % _SAVE_EVERY == 0:
+        save_progress(progress, progress_file)
+    input(colorize("Press Enter for next question...", Colors.DIM))
+    return True
 
 
 def run_quiz(questions: list, progress: Progress, progress_file: str,
@@ -448,6 +570,7 @@ def run_quiz(questions: list, progress: Progress, progress_file: str,
             return
 
     # Quiz complete
+    save_progress(progress, progress_file)
     clear_screen()
     print_header()
     print(colorize("QUIZ COMPLETE!", Colors.GREEN + Colors.BOLD))
@@ -466,11 +589,12 @@ def _print_exam_results(progress: Progress, time_used_s: float, total: int):
     passed = pct >= 72
     mins, secs = int(time_used_s // 60), int(time_used_s % 60)
     verdict_color = Colors.GREEN if passed else Colors.RED
-    print(colorize("═" * 62, verdict_color))
+    rule = _RULE_GREEN if passed else _RULE_RED
+    print(rule)
     print(colorize(
         f"  {'PASS' if passed else 'FAIL'} — {pct}%  "
         f"({'≥' if passed else '<'}72% threshold)", verdict_color + Colors.BOLD))
-    print(colorize("═" * 62, verdict_color))
+    print(rule)
     print()
     print(f"  Score:     {correct} / {answered} correct  ({total} question exam)")
     print(f"  Time used: {mins}:{secs:02d} / 130:00")
@@ -501,6 +625,7 @@ def run_timed_exam(questions: list, progress: Progress, progress_file: str):
         if not _answer_question(question, progress, progress_file, i):
             break  # user quit early
 
+    save_progress(progress, progress_file)
     time_used_s = time.time() - (end_time - 130 * 60)
     _print_exam_results(progress, time_used_s, len(exam_qs))
     input(colorize("Press Enter to continue...", Colors.DIM))
@@ -522,6 +647,13 @@ def main():
     global _cert_name
     script_dir = Path(__file__).parent
 
+    if os.name == 'nt':
+        os.system('')  # turns on ANSI escape handling in the Windows console
+    # Every screen ends in input(), which flushes stdout before prompting, so
+    # without line buffering each screen reaches the terminal in one write.
+    if getattr(sys.stdout, 'line_buffering', False):
+        sys.stdout.reconfigure(line_buffering=False)
+
     if len(sys.argv) > 1:
         arg = sys.argv[1]
         arg_path = Path(arg)
@@ -548,7 +680,6 @@ def main():
             print("Run parse_questions.py first or pass a cert ID as argument.")
             sys.exit(1)
 
-    questions_file = Path(questions_file)
     progress_file = progress_path_from_questions(questions_file)
     _cert_name = cert_name_from_path(questions_file)
 
@@ -557,44 +688,49 @@ def main():
         print("Run parse_questions.py first to generate the questions file.")
         sys.exit(1)
 
-    print("Loading questions...")
+    print("Loading questions...", flush=True)
     questions = load_questions(str(questions_file))
     progress = load_progress(str(progress_file))
     progress.total_questions = len(questions)
+    domain_index = build_domain_index(questions)
 
     print(f"Loaded {len(questions)} questions.")
 
     current_questions = questions
 
-    while True:
-        choice = show_menu(current_questions, progress)
-
-        if choice == '1':
-            run_quiz(current_questions, progress, str(progress_file), randomize=True)
-        elif choice == '2':
-            run_quiz(current_questions, progress, str(progress_file), randomize=False)
-        elif choice == '3':
-            run_quiz(current_questions, progress, str(progress_file),
-                    randomize=False, start_index=progress.last_question_index)
-        elif choice == '4':
-            domain = show_domain_menu(questions)
-            if domain:
-                current_questions = filter_by_domain(questions, domain)
-                if not current_questions:
-                    print(colorize("No questions found for that domain.", Colors.RED))
-                    current_questions = questions
-                    input("Press Enter to continue...")
-        elif choice == '5':
-            show_statistics(questions, progress)
-        elif choice == '6':
-            progress = reset_progress(progress, str(progress_file))
-        elif choice.lower() == 'e':
-            run_timed_exam(questions, progress, str(progress_file))
-        elif choice.lower() == 'q':
-            save_progress(progress, str(progress_file))
-            clear_screen()
-            print(colorize("Thanks for studying! Good luck on your exam!", Colors.GREEN))
-            break
+    # Answers are only saved every few questions, so make sure the last ones
+    # are written however the session ends (including Ctrl+C).
+    try:
+        while True:
+            choice = show_menu(current_questions, progress)
+
+            if choice == '1':
+                run_quiz(current_questions, progress, str(progress_file), randomize=True)
+            elif choice == '2':
+                run_quiz(current_questions, progress, str(progress_file), randomize=False)
+            elif choice == '3':
+                run_quiz(current_questions, progress, str(progress_file),
+                        randomize=False, start_index=progress.last_question_index)
+            elif choice == '4':
+                domain = show_domain_menu(domain_index)
+                if domain:
+                    current_questions = filter_by_domain(questions, domain_index, domain)
+                    if not current_questions:
+                        print(colorize("No questions found for that domain.", Colors.RED))
+                        current_questions = questions
+                        input("Press Enter to continue...")
+            elif choice == '5':
+                show_statistics(questions, progress)
+            elif choice == '6':
+                progress = reset_progress(progress, str(progress_file))
+            elif choice.lower() == 'e':
+                run_timed_exam(questions, progress, str(progress_file))
+            elif choice.lower() == 'q':
+                clear_screen()
+                print(colorize("Thanks for studying! Good luck on your exam!", Colors.GREEN))
+                break
+    finally:
+        save_progress(progress, str(progress_file))
 
 
 if __name__ == "__main__":
@@ -7,75 +7,99 @@ combining them into a structured JSON file.
 import argparse
 import json
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
-
-def parse_questions_from_pdf(pdf_text_path: str) -> dict:
+# Patterns are compiled once at import instead of going through re's cache
+# on every call.
+_Q_HEADER_PAT = re.compile(r'Question\s+#(\d+)\s+Topic\s+\d+')
+_OPTION_PAT = re.compile(r'\n\s{2,}([A-F])\.\s+')                # indented "A." option letter
+_ANS_Q_PAT = re.compile(r'(?:^|\n)(\d+)\s*\]')              # solutions block header
+_SEP_PAT = re.compile(r'-{10,}')
+_LETTER_LINE = re.compile(r'(?:^|\n)\s*([A-F])\.\s+')
+# Methods 1-3 of the answer cascade as one pattern: "Correct answer X:",
+# an "ans-" prefix, or a standalone "X." line (the last one case-sensitive).
+# Trailing whitespace is only looked at, never consumed, so one marker
+# cannot swallow the newline that starts the next.
+_ANSWER_MARKERS = re.compile(
+    r'(?P<correct>(?i:Correct\s+answer\s+(?P<cletter>[A-F]):))'
+    r'|(?P<ans>(?i:\n\s*ans)(?=(?P<anstail>[-–—]?\s*[-–—]?\s*)))'
+    r'|(?P<standalone>\n\s*(?P<sletter>[A-F])\.(?=\s))')
+# The standalone alternative on its own, for blocks without either keyword
+_STANDALONE_MARKER = re.compile(r'(?P<standalone>\n\s*(?P<sletter>[A-F])\.(?=\s))')
+_LETTER_START = re.compile(r'^([A-Fa-f])[\.\s:\-]')
+_ANS_TEXT = re.compile(r'ans[-–—]?\s*[-–—]?\s*(.+?)(?:\n\n|\n[A-Z][a-z])',
+                       re.IGNORECASE | re.DOTALL)
+_NONWORD = re.compile(r'[^\w\s]+')
+_WS = re.compile(r'\s+')
+
+# One encoder for all output records; json.dumps with non-default options
+# would build a new JSONEncoder per call.
+_encode_record = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _question_record(q_num: int, question_text: str, options: dict) -> dict:
+    return {
+        'number': q_num,
+        'question': question_text,
+        'options': options,
+        'correct_answer': None,
+        'explanation': ''
+    }
+
+
+def parse_questions_from_pdf(pdf_text_path: str | Path) -> dict:
     """Parse questions and options from the PDF text file."""
-    with open(pdf_text_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = Path(pdf_text_path).read_text(encoding='utf-8')
 
     questions = {}
+    headers = list(_Q_HEADER_PAT.finditer(content))
 
-    # Split by question pattern
-    question_pattern = r'Question\s+#(\d+)\s+Topic\s+\d+'
-    matches = list(re.finditer(question_pattern, content))
-
-    for i, match in enumerate(matches):
+    for i, match in enumerate(headers):
         q_num = int(match.group(1))
-        start = match.end()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
-
-        block = content[start:end].strip()
-
-        # Options start with letter followed by period
-        option_pattern = r'\n\s{2,}([A-F])\.\s+'
-
-        first_option = re.search(option_pattern, block)
-
-        if first_option:
-            question_text = block[:first_option.start()].strip()
-            options_text = block[first_option.start():]
-
-            options = {}
-            option_matches = list(re.finditer(option_pattern, options_text))
-
-            for j, opt_match in enumerate(option_matches):
-                letter = opt_match.group(1)
-                opt_start = opt_match.end()
-                opt_end = option_matches[j + 1].start() if j + 1 < len(option_matches) else len(options_text)
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(content)
 
-                option_text = options_text[opt_start:opt_end].strip()
-                option_text = ' '.join(option_text.split())
-                options[letter] = option_text
+        # Stripped first, so an option letter has to follow the question text
+        # and an empty option at the very end of the block is dropped.
+        block = content[match.end():end].strip()
+        option_matches = list(_OPTION_PAT.finditer(block))
+        if not option_matches:
+            continue
 
-            question_text = ' '.join(question_text.split())
+        options = {}
+        for j, opt_match in enumerate(option_matches):
+            opt_end = (option_matches[j + 1].start() if j + 1 < len(option_matches)
+                       else len(block))
+            options[opt_match.group(1)] = _WS.sub(' ', block[opt_match.end():opt_end]).strip()
 
-            questions[q_num] = {
-                'number': q_num,
-                'question': question_text,
-                'options': options,
-                'correct_answer': None,
-                'explanation': ''
-            }
+        question_text = _WS.sub(' ', block[:option_matches[0].start()]).strip()
+        questions[q_num] = _question_record(q_num, question_text, options)
 
     return questions
 
 
+@lru_cache(maxsize=4096)
 def normalize_text(text: str) -> str:
     """Normalize text for comparison."""
     # Remove punctuation, extra spaces, and lowercase
-    text = re.sub(r'[^\w\s]', '', text.lower())
-    text = ' '.join(text.split())
+    text = _WS.sub(' ', _NONWORD.sub('', text.lower())).strip()
     return text[:100]  # First 100 chars for comparison
 
 
+@lru_cache(maxsize=4096)
+def _token_set(normalized: str) -> frozenset:
+    """Word set of an already normalized string, cached like normalize_text."""
+    return frozenset(normalized.split())
+
+
 def find_matching_option(answer_text: str, options: dict):
     """Try to match answer text to one of the options."""
     if not answer_text or not options:
         return None
 
     answer_norm = normalize_text(answer_text)
+    answer_tokens = _token_set(answer_norm)
 
     best_match = None
     best_score = 0
@@ -83,13 +107,12 @@ def find_matching_option(answer_text: str, options: dict):
     for letter, option_text in options.items():
         option_norm = normalize_text(option_text)
 
-        # Check if one contains the other
-        if answer_norm in option_norm or option_norm in answer_norm:
-            # Calculate overlap score
-            score = len(set(answer_norm.split()) & set(option_norm.split()))
-            if score > best_score:
-                best_score = score
-                best_match = letter
+        # Overlap score first; the containment check only matters for an
+        # option that could become the new best match.
+        score = len(answer_tokens & _token_set(option_norm))
+        if score > best_score and (answer_norm in option_norm or option_norm in answer_norm):
+            best_score = score
+            best_match = letter
 
     # Require at least 3 matching words
     if best_score >= 3:
@@ -100,9 +123,7 @@ def find_matching_option(answer_text: str, options: dict):
 
 def is_multi_select(question_text: str) -> int:
     """Return the number of expected answers (2 for 'Choose two', else 1)."""
-    if re.search(r'Choose two', question_text, re.IGNORECASE):
-        return 2
-    return 1
+    return 2 if 'choose two' in question_text.lower() else 1
 
 
 def extract_multi_answers(main_content: str, num_expected: int) -> str:
@@ -111,139 +132,185 @@ def extract_multi_answers(main_content: str, num_expected: int) -> str:
     Looks for lines starting with a letter followed by a period (e.g. 'A. ...')
     and returns the first `num_expected` unique letters found.
     """
-    # Find all lines that start with an answer letter pattern
-    letter_matches = re.findall(r'(?:^|\n)\s*([A-F])\.\s+', main_content)
     seen = []
-    for letter in letter_matches:
-        letter = letter.upper()
-        if letter not in seen:
+    seen_set = set()
+    for letter in _LETTER_LINE.findall(main_content):  # already upper-case
+        if letter not in seen_set:
+            seen_set.add(letter)
             seen.append(letter)
-        if len(seen) == num_expected:
-            break
-    return ''.join(seen) if len(seen) == num_expected else None
+            if len(seen) == num_expected:
+                return ''.join(seen)
+    return None
 
 
-def parse_answers_from_solutions(solutions_path: str, questions: dict) -> dict:
-    """Parse correct answers and explanations from the solutions file."""
-    with open(solutions_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+def _split_double_nl(text: str) -> tuple:
+    """Split text at its first blank line; the tail is '' if there is none."""
+    i = text.find('\n\n')
+    if i < 0:
+        return text, ''
+    return text[:i], text[i + 2:].lstrip('\n')
 
-    answers = {}
 
-    question_pattern = r'(?:^|\n)(\d+)\s*\]'
-    matches = list(re.finditer(question_pattern, content))
+def _parse_one_block(item: tuple) -> tuple:
+    """Run the answer-detection cascade on one solutions block.
 
+    `item` is (q_num, main_content, q_text, options), where options is None
+    when the question itself was not parsed. Returns (q_num, answer) with
+    answer None if no letter could be found. Kept at module level so worker
+    processes can pickle it.
+    """
+    q_num, main_content, q_text, options = item
+    lowered = main_content.lower()  # cheap keyword probes before the regexes
+
+    # Check if this is a multi-select question
+    num_answers = is_multi_select(q_text)
+
+    answer_letter = None
+    answer_text = ""
+    explanation = ""
+
+    # For multi-select questions, try to extract all answer letters at once
+    if num_answers > 1:
+        multi = extract_multi_answers(main_content, num_answers)
+        if multi:
+            answer_letter = multi
+
+    # Methods 1-3 look for different markers in the same block. Find the first
+    # of each kind in one pass; "Correct answer" outranks the rest, so stop
+    # as soon as it turns up.
+    correct_match = ans_match = standalone_match = None
+    if not answer_letter:
+        if 'correct' in lowered or 'ans' in lowered:
+            markers = _ANSWER_MARKERS
+        else:
+            markers = _STANDALONE_MARKER  # skips the case-insensitive branches
+        for match in markers.finditer(main_content):
+            kind = match.lastgroup
+            if kind == 'correct':
+                correct_match = match
+                break
+            if kind == 'ans':
+                ans_match = ans_match or match
+            else:
+                standalone_match = standalone_match or match
+
+    # Method 1: Look for "Correct answer X:" pattern
+    if correct_match:
+        answer_letter = correct_match.group('cletter').upper()
+
+    # Method 2: Look for "ans-" pattern
+    if not answer_letter and ans_match:
+        rest = main_content[ans_match.end('anstail'):].strip()
+
+        # Check if starts with letter
+        letter_match = _LETTER_START.match(rest)
+        if letter_match:
+            answer_letter = letter_match.group(1).upper()
+            rest = rest[letter_match.end():].strip()
+
+        # Get answer text (first line or until double newline)
+        lines = rest.split('\n')
+        answer_text = lines[0].strip() if lines else ""
+
+        # Get explanation
+        _, tail = _split_double_nl(rest)
+        if tail:
+            explanation = tail.strip()
+
+    # Method 3: Look for standalone letter pattern "A." or "B."
+    if not answer_letter and standalone_match:
+        answer_letter = standalone_match.group('sletter')
+        rest = main_content[standalone_match.end():].strip()
+        answer_text = rest.split('\n')[0].strip()
+        _, tail = _split_double_nl(rest)
+        if tail:
+            explanation = tail.strip()
+
+    # Method 4: If no letter found, try to match answer text to options
+    if not answer_letter and answer_text and options is not None:
+        answer_letter = find_matching_option(answer_text, options)
+
+    # Method 5: If still no letter, extract answer text after "ans-" and match
+    if not answer_letter and options is not None and 'ans' in lowered:
+        ans_match = _ANS_TEXT.search(main_content)
+        if ans_match:
+            answer_text = ans_match.group(1).strip()
+            answer_letter = find_matching_option(answer_text, options)
+
+    if not answer_letter:
+        return q_num, None
+
+    # Get explanation if we don't have it yet
+    if not explanation:
+        # Everything after the answer line
+        ans_pos = main_content.find('ans')
+        if ans_pos == -1:
+            ans_pos = main_content.find(answer_letter[0] + '.')
+        if ans_pos != -1:
+            rest = main_content[ans_pos:]
+            _, tail = _split_double_nl(rest)
+            if tail:
+                explanation = tail.strip()
+
+    return q_num, {
+        'answer': answer_letter,
+        'explanation': explanation[:1500] if explanation else ""
+    }
+
+
+def parse_answers_from_solutions(solutions_path: str | Path, questions: dict,
+                                 jobs: int = 1) -> dict:
+    """Parse correct answers and explanations from the solutions file.
+
+    Blocks are independent, so with jobs > 1 they are parsed in a process pool.
+    """
+    content = Path(solutions_path).read_text(encoding='utf-8')
+
+    matches = list(_ANS_Q_PAT.finditer(content))
+
+    items = []
     for i, match in enumerate(matches):
         q_num = int(match.group(1))
         start = match.end()
         end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
 
-        block = content[start:end].strip()
-        parts = re.split(r'-{10,}', block)
-        if not parts:
-            continue
+        # Only the text before the first separator line is used, so cut it
+        # straight out of the file instead of copying and splitting the block.
+        sep = _SEP_PAT.search(content, start, end)
+        main_content = content[start:sep.start() if sep else end].strip()
+
+        question = questions.get(q_num)
+        if question:
+            items.append((q_num, main_content, question['question'], question['options']))
+        else:
+            items.append((q_num, main_content, "", None))
+
+    if jobs > 1 and len(items) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_parse_one_block, items, chunksize=32))
+    else:
+        results = map(_parse_one_block, items)
 
-        main_content = parts[0].strip()
-
-        # Check if this is a multi-select question
-        q_text = questions[q_num]['question'] if q_num in questions else ""
-        num_answers = is_multi_select(q_text)
-
-        answer_letter = None
-        answer_text = ""
-        explanation = ""
-
-        # For multi-select questions, try to extract all answer letters at once
-        if num_answers > 1:
-            multi = extract_multi_answers(main_content, num_answers)
-            if multi:
-                answer_letter = multi
-
-        # Method 1: Look for "Correct answer X:" pattern
-        if not answer_letter:
-            correct_match = re.search(r'Correct\s+answer\s+([A-F]):', main_content, re.IGNORECASE)
-            if correct_match:
-                answer_letter = correct_match.group(1).upper()
-
-        # Method 2: Look for "ans-" pattern
-        if not answer_letter:
-            ans_match = re.search(r'\n\s*ans[-–—]?\s*[-–—]?\s*', main_content, re.IGNORECASE)
-            if ans_match:
-                rest = main_content[ans_match.end():].strip()
-
-                # Check if starts with letter
-                letter_match = re.match(r'^([A-F])[\.\s:\-]', rest, re.IGNORECASE)
-                if letter_match:
-                    answer_letter = letter_match.group(1).upper()
-                    rest = rest[letter_match.end():].strip()
-
-                # Get answer text (first line or until double newline)
-                lines = rest.split('\n')
-                answer_text = lines[0].strip() if lines else ""
-
-                # Get explanation
-                exp_parts = re.split(r'\n\n+', rest, maxsplit=1)
-                if len(exp_parts) > 1:
-                    explanation = exp_parts[1].strip()
-
-        # Method 3: Look for standalone letter pattern "A." or "B."
-        if not answer_letter:
-            letter_match = re.search(r'\n\s*([A-F])\.\s+', main_content)
-            if letter_match:
-                answer_letter = letter_match.group(1).upper()
-                rest = main_content[letter_match.end():].strip()
-                answer_text = rest.split('\n')[0].strip()
-                exp_parts = re.split(r'\n\n+', rest, maxsplit=1)
-                if len(exp_parts) > 1:
-                    explanation = exp_parts[1].strip()
-
-        # Method 4: If no letter found, try to match answer text to options
-        if not answer_letter and answer_text and q_num in questions:
-            answer_letter = find_matching_option(answer_text, questions[q_num]['options'])
-
-        # Method 5: If still no letter, extract answer text after "ans-" and match
-        if not answer_letter and q_num in questions:
-            ans_match = re.search(r'ans[-–—]?\s*[-–—]?\s*(.+?)(?:\n\n|\n[A-Z][a-z])', main_content, re.IGNORECASE | re.DOTALL)
-            if ans_match:
-                answer_text = ans_match.group(1).strip()
-                answer_letter = find_matching_option(answer_text, questions[q_num]['options'])
-
-        if answer_letter:
-            # Get explanation if we don't have it yet
-            if not explanation:
-                # Everything after the answer line
-                ans_pos = main_content.find('ans')
-                if ans_pos == -1:
-                    ans_pos = main_content.find(answer_letter[0] + '.')
-                if ans_pos != -1:
-                    rest = main_content[ans_pos:]
-                    exp_parts = re.split(r'\n\n+', rest, maxsplit=1)
-                    if len(exp_parts) > 1:
-                        explanation = exp_parts[1].strip()
-
-            answers[q_num] = {
-                'answer': answer_letter,
-                'explanation': explanation[:1500] if explanation else ""
-            }
-
-    return answers
+    return {q_num: answer for q_num, answer in results if answer}
 
 
 def combine_questions_and_answers(questions: dict, answers: dict) -> list:
     """Combine questions with their correct answers."""
     combined = []
 
-    for q_num, q_data in sorted(questions.items()):
-        if q_num in answers:
-            q_data['correct_answer'] = answers[q_num]['answer']
-            q_data['explanation'] = answers[q_num]['explanation']
+    for q_num in sorted(questions):
+        q_data = questions[q_num]
+        parsed = answers.get(q_num)
+        if parsed:
+            q_data['correct_answer'] = parsed['answer']
+            q_data['explanation'] = parsed['explanation']
 
         # Only include questions that have options and a valid correct answer
-        if q_data['options'] and q_data['correct_answer']:
-            # Validate all letters in correct_answer exist in options
-            answer = q_data['correct_answer']
-            if all(letter in q_data['options'] for letter in answer):
-                combined.append(q_data)
+        options = q_data['options']
+        answer = q_data['correct_answer']
+        # Validate all letters in correct_answer exist in options
+        if options and answer and set(answer).issubset(options):
+            combined.append(q_data)
 
     return combined
 
@@ -260,6 +327,8 @@ def main():
                         help="Solutions text file (default: AWS {CERT}-Solution.txt)")
     parser.add_argument("--output", default=None,
                         help="Output JSON file (default: {cert}_questions.json)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes for answer parsing (default: 1)")
     args = parser.parse_args()
 
     cert = args.cert.lower()
@@ -271,20 +340,26 @@ def main():
     output_path = Path(args.output) if args.output else script_dir / f"{cert}_questions.json"
 
     print(f"Parsing questions for {cert_upper}...")
-    questions = parse_questions_from_pdf(str(pdf_text_path))
+    questions = parse_questions_from_pdf(pdf_text_path)
     print(f"Found {len(questions)} questions in PDF")
 
     print("Parsing answers from solutions file...")
-    answers = parse_answers_from_solutions(str(solutions_path), questions)
+    answers = parse_answers_from_solutions(solutions_path, questions, args.jobs)
     print(f"Found {len(answers)} answers in solutions file")
 
     print("Combining questions and answers...")
     combined = combine_questions_and_answers(questions, answers)
     print(f"Combined {len(combined)} complete questions")
 
-    # Save to JSON
+    # Save to JSON, one question per line. Writing records one at a time keeps
+    # us on the fast C encoder instead of the indent pretty-printer.
     with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(combined, f, indent=2, ensure_ascii=False)
+        f.write('[\n')
+        for i, record in enumerate(combined):
+            if i:
+                f.write(',\n')
+            f.write(_encode_record(record))
+        f.write('\n]\n')
 
     print(f"Saved to {output_path}")
 
@@ -0,0 +1,46 @@
+// Question page behaviour. The form carries data-multi (answers to pick) and,
+// during a timed exam, data-exam-end (Unix seconds).
+(function () {
+  var form = document.getElementById('quiz-form');
+  if (!form) return;
+  var multi = parseInt(form.dataset.multi, 10) || 1;
+  var labels = document.querySelectorAll('.option-label');
+
+  function markSelected() {
+    labels.forEach(function (l) {
+      var input = l.querySelector('input');
+      l.classList.toggle('selected', !!(input && input.checked));
+    });
+  }
+
+  form.addEventListener('change', function () {
+    markSelected();
+    if (multi > 1) {
+      var checked = form.querySelectorAll('input[type=checkbox]:checked').length;
+      var btn = document.getElementById('submit-btn');
+      btn.disabled = (checked !== multi);
+      btn.textContent = checked < multi
+        ? 'Select ' + (multi - checked) + ' more'
+        : 'Submit ' + multi + ' Answers';
+    } else {
+      setTimeout(function () { form.submit(); }, 180);
+    }
+  });
+
+  var badge = document.getElementById('exam-timer');
+  var examEnd = parseFloat(form.dataset.examEnd);
+  if (badge && examEnd) {
+    var endMs = examEnd * 1000;
+    (function tick() {
+      var rem = Math.max(0, Math.round((endMs - Date.now()) / 1000));
+      var m = Math.floor(rem / 60), s = rem % 60;
+      badge.textContent = m + ':' + (s < 10 ? '0' : '') + s;
+      if (rem <= 300) {
+        badge.style.color = 'var(--red)';
+        badge.style.borderColor = 'var(--red-dim)';
+      }
+      if (rem <= 0) { window.location.href = '/quiz/complete'; return; }
+      setTimeout(tick, 1000);
+    })();
+  }
+})();
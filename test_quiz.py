@@ -2,27 +2,36 @@
 """Tests for AWS quiz application."""
 
 import json
-import re
+import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
-from aws_quiz import Question, is_multi_select, display_result
+from aws_quiz import (
+    Question, is_multi_select, display_result, extract_domain,
+    build_domain_index, get_domains, filter_by_domain, get_domain_stats,
+    Progress, load_progress, save_progress, record_answer, get_weak_spots,
+    delta_line, append_delta, delta_log_path, _SEP_DELETE,
+)
+import web_quiz
 from parse_questions import (
     is_multi_select as parser_is_multi_select,
-    extract_multi_answers,
+    extract_multi_answers, parse_questions_from_pdf, parse_answers_from_solutions,
 )
 
 QUESTIONS_FILE = Path(__file__).parent / "saa-c03_questions.sample.json"
 
 
-def make_question(text="Sample question?", correct_answer="A", options=None):
+def make_question(text="Sample question?", correct_answer="A", options=None,
+                  number=1, domain=""):
     """Helper to build a Question with sensible defaults."""
     if options is None:
         options = {"A": "Option A", "B": "Option B", "C": "Option C", "D": "Option D"}
     return Question(
-        number=1, text=text, options=options,
-        correct_answer=correct_answer, explanation="Explanation."
+        number=number, text=text, options=options,
+        correct_answer=correct_answer, explanation="Explanation.", domain=domain
     )
 
 
@@ -79,6 +88,68 @@ class TestExtractMultiAnswers(unittest.TestCase):
         self.assertIsNone(extract_multi_answers("", 2))
 
 
+# ---------------------------------------------------------------------------
+# Parser: parse_questions_from_pdf
+# ---------------------------------------------------------------------------
+class TestParseQuestionsFromPdf(unittest.TestCase):
+    def parse(self, text):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "q.txt"
+            path.write_text(text, encoding="utf-8")
+            return parse_questions_from_pdf(path)
+
+    def test_question_and_options(self):
+        questions = self.parse("Question #1 Topic 1\nWhich one?\n  A. First\n  B. Second\n   line\n")
+        self.assertEqual(questions[1]["question"], "Which one?")
+        self.assertEqual(questions[1]["options"], {"A": "First", "B": "Second line"})
+
+    def test_option_line_right_after_header_is_question_text(self):
+        questions = self.parse("Question #1 Topic 1\n  A. Looks like an option\n  B. Real option\n")
+        self.assertEqual(questions[1]["question"], "A. Looks like an option")
+        self.assertEqual(questions[1]["options"], {"B": "Real option"})
+
+    def test_trailing_empty_option_not_an_option(self):
+        # Stripping the block removes the whitespace a letter needs after "D."
+        questions = self.parse("Question #4 Topic 1\nQ?\n  A. One\n  B. Two\n  D.\nQuestion #5 Topic 1\nQ5?\n  A. x\n")
+        self.assertEqual(questions[4]["options"], {"A": "One", "B": "Two D."})
+        self.assertEqual(questions[5]["options"], {"A": "x"})
+
+    def test_question_without_options_skipped(self):
+        questions = self.parse("Question #1 Topic 1\nNo options here\nQuestion #2 Topic 1\n  A.\n")
+        self.assertEqual(questions, {})
+
+
+# ---------------------------------------------------------------------------
+# Parser: parse_answers_from_solutions
+# ---------------------------------------------------------------------------
+class TestParseAnswersFromSolutions(unittest.TestCase):
+    def parse(self, text, questions=None):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "s.txt"
+            path.write_text(text, encoding="utf-8")
+            return parse_answers_from_solutions(path, questions or {})
+
+    def test_ans_explanation_kept_when_standalone_letter_follows(self):
+        answers = self.parse("1] Question text\nans- use the bucket\n\n"
+                             "Because it is explained here\nB. short\n" + "-" * 12 + "\n")
+        self.assertEqual(answers[1], {"answer": "B",
+                                      "explanation": "Because it is explained here\nB. short"})
+
+    def test_correct_answer_marker(self):
+        answers = self.parse("2] Correct answer C: something\n\nWhy C.\n")
+        self.assertEqual(answers[2]["answer"], "C")
+
+    def test_jobs_do_not_change_output(self):
+        text = "".join(f"{n}] Question {n}\nans- option {n}\n\nBecause {n}\nB. short\n" + "-" * 12 + "\n"
+                       for n in range(1, 9))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "s.txt"
+            path.write_text(text, encoding="utf-8")
+            serial = parse_answers_from_solutions(path, {}, jobs=1)
+            self.assertEqual(len(serial), 8)
+            self.assertEqual(parse_answers_from_solutions(path, {}, jobs=2), serial)
+
+
 # ---------------------------------------------------------------------------
 # Quiz: is_multi_select
 # ---------------------------------------------------------------------------
@@ -91,6 +162,168 @@ class TestQuizIsMultiSelect(unittest.TestCase):
         q = make_question(text="Which is the best solution?")
         self.assertEqual(is_multi_select(q), 1)
 
+    def test_derived_fields(self):
+        q = make_question(options={"B": "Second", "A": "First"}, correct_answer="BA")
+        self.assertEqual(q.options_sorted, (("A", "First"), ("B", "Second")))
+        self.assertEqual(q.correct_set, {"A", "B"})
+        self.assertEqual(make_question(domain="Storage, Compute").domain_set, {"Storage", "Compute"})
+        self.assertEqual(make_question().domain_set, frozenset())
+
+
+# ---------------------------------------------------------------------------
+# Quiz: extract_domain
+# ---------------------------------------------------------------------------
+class TestExtractDomain(unittest.TestCase):
+    def test_general_when_no_keywords(self):
+        self.assertEqual(extract_domain("Which option is cheapest?"), "General")
+
+    def test_case_insensitive(self):
+        self.assertEqual(extract_domain("Store objects in s3"), "Storage")
+
+    def test_domain_order_not_text_order(self):
+        self.assertEqual(extract_domain("Use DynamoDB with EC2"), "Compute, Database")
+
+    def test_at_most_two_domains(self):
+        self.assertEqual(extract_domain("EC2, S3, RDS and SQS"), "Compute, Storage")
+
+    def test_overlapping_keywords(self):
+        # 'VPC' and 'Config' share the 'C'; both must be reported
+        self.assertEqual(extract_domain("VPConfig"), "Networking, Management")
+
+
+# ---------------------------------------------------------------------------
+# Quiz: domain index
+# ---------------------------------------------------------------------------
+class TestDomainIndex(unittest.TestCase):
+    def setUp(self):
+        self.questions = [
+            make_question(number=1, domain="Compute, Storage"),
+            make_question(number=2, domain="Storage"),
+            make_question(number=3, domain="General"),
+        ]
+        self.index = build_domain_index(self.questions)
+
+    def test_question_in_every_domain_bucket(self):
+        self.assertEqual([q.number for q in self.index["Storage"]], [1, 2])
+        self.assertEqual([q.number for q in self.index["Compute"]], [1])
+
+    def test_get_domains_sorted(self):
+        self.assertEqual(get_domains(self.index), ["Compute", "General", "Storage"])
+
+    def test_filter_all(self):
+        self.assertEqual(filter_by_domain(self.questions, self.index, "all"), self.questions)
+
+    def test_filter_returns_copy(self):
+        result = filter_by_domain(self.questions, self.index, "Storage")
+        result.clear()
+        self.assertEqual(len(self.index["Storage"]), 2)
+
+    def test_filter_unknown_domain(self):
+        self.assertEqual(filter_by_domain(self.questions, self.index, "Nope"), [])
+
+    def test_domain_stats(self):
+        progress = Progress(question_stats={1: {"seen": 2, "correct": 1},
+                                            2: {"seen": 1, "correct": 0}})
+        stats = get_domain_stats(self.questions, progress)
+        self.assertEqual(list(stats), ["Compute", "General", "Storage"])
+        self.assertEqual(stats["Storage"], {"total": 2, "attempted": 2, "correct": 1})
+        self.assertEqual(stats["General"], {"total": 1, "attempted": 0, "correct": 0})
+
+
+# ---------------------------------------------------------------------------
+# Quiz: Progress serialization
+# ---------------------------------------------------------------------------
+class TestProgressToDict(unittest.TestCase):
+    def setUp(self):
+        self.progress = Progress(questions_answered=3, correct_answers=2,
+                                 question_stats={7: {"seen": 3, "correct": 2}})
+
+    def test_stats_keys_become_strings(self):
+        data = self.progress.to_dict()
+        self.assertEqual(data["question_stats"], {"7": {"seen": 3, "correct": 2}})
+        self.assertEqual(data["questions_answered"], 3)
+
+    def test_round_trip_through_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / ".x_progress.json")
+            save_progress(self.progress, path)
+            loaded = load_progress(path)
+        self.assertEqual(loaded.question_stats, {7: {"seen": 3, "correct": 2}})
+        self.assertEqual(loaded.correct_answers, 2)
+
+    def test_failed_save_leaves_no_temp_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / ".x_progress.json")
+            save_progress(self.progress, path)
+            with patch("aws_quiz.os.replace", side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    save_progress(Progress(), path)
+            self.assertEqual(sorted(p.name for p in Path(tmp).iterdir()), [".x_progress.json"])
+            self.assertEqual(load_progress(path).correct_answers, 2)
+
+    def test_truncated_stats_entry_still_loads(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / ".x_progress.json"
+            path.write_text(json.dumps({"question_stats": {"7": {"seen": 2}, "8": {}}}))
+            loaded = load_progress(str(path))
+        self.assertEqual(loaded.question_stats, {7: {"seen": 2}, 8: {}})
+        self.assertEqual(loaded.weak_numbers, {7})
+
+    def test_missing_file_gives_empty_progress(self):
+        self.assertEqual(load_progress("/nonexistent/.x_progress.json"), Progress())
+
+    def test_delta_log_replayed_then_cleared_by_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / ".x_progress.json")
+            save_progress(self.progress, path)
+            self.progress.current_session_correct = self.progress.current_session_total = 0
+            for number, ok in ((7, False), (8, True)):
+                record_answer(self.progress, number, ok, number)
+                append_delta(path, delta_line(self.progress, number, ok))
+            # Malformed lines are skipped: valid JSON of the wrong shape, then a torn write
+            append_delta(path, '1\n{"q": 9, "correct": true}\n{"q": 9, "corr')
+            loaded = load_progress(path)
+            self.assertEqual(loaded.question_stats, {7: {"seen": 4, "correct": 2},
+                                                     8: {"seen": 1, "correct": 1}})
+            self.assertEqual((loaded.questions_answered, loaded.correct_answers), (5, 3))
+            self.assertEqual((loaded.current_session_total, loaded.current_session_correct), (2, 1))
+            self.assertEqual(loaded.weak_numbers, {7})
+            save_progress(loaded, path)
+            self.assertFalse(Path(delta_log_path(path)).exists())
+            self.assertEqual(load_progress(path).questions_answered, 5)
+
+
+# ---------------------------------------------------------------------------
+# Quiz: record_answer
+# ---------------------------------------------------------------------------
+class TestRecordAnswer(unittest.TestCase):
+    def test_correct_then_incorrect(self):
+        progress = Progress()
+        record_answer(progress, 5, True, 0)
+        record_answer(progress, 5, False, 3)
+        self.assertEqual(progress.question_stats, {5: {"seen": 2, "correct": 1}})
+        self.assertEqual((progress.questions_answered, progress.correct_answers), (2, 1))
+        self.assertEqual((progress.current_session_total, progress.current_session_correct), (2, 1))
+        self.assertEqual(progress.last_question_index, 3)
+        self.assertEqual(progress.weak_numbers, {5})
+
+
+# ---------------------------------------------------------------------------
+# Quiz: get_weak_spots
+# ---------------------------------------------------------------------------
+class TestWeakSpots(unittest.TestCase):
+    def test_sorted_by_accuracy_ties_keep_order(self):
+        questions = [make_question(number=n) for n in (1, 2, 3, 4, 5)]
+        progress = Progress(question_stats={
+            1: {"seen": 2, "correct": 1},
+            2: {"seen": 3, "correct": 3},  # never missed
+            3: {"seen": 4, "correct": 0},
+            5: {"seen": 4, "correct": 2},
+        })
+        weak = get_weak_spots(questions, progress)
+        self.assertEqual([q.number for q in weak], [3, 1, 5])
+        self.assertEqual(progress.weak_numbers, {1, 3, 5})
+
 
 # ---------------------------------------------------------------------------
 # Quiz: answer validation logic (mirrors run_quiz checks)
@@ -101,7 +334,7 @@ class TestAnswerValidation(unittest.TestCase):
     @staticmethod
     def check_answer(user_input, correct_answer, multi):
         """Replicate the validation logic from run_quiz."""
-        cleaned = re.sub(r'[\s,/]+', '', user_input.strip().upper())
+        cleaned = user_input.strip().upper().translate(_SEP_DELETE)
         if multi > 1:
             letters = list(dict.fromkeys(cleaned))
             if len(letters) != multi:
@@ -187,8 +420,11 @@ class TestDisplayResult(unittest.TestCase):
 class TestQuestionsJson(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        with open(QUESTIONS_FILE) as f:
-            cls.data = json.load(f)
+        cls.data = json.loads(QUESTIONS_FILE.read_bytes())
+        cls.choose_two = [q for q in cls.data if "Choose two" in q["question"]]
+        cls.single = [q for q in cls.data
+                      if "Choose two" not in q["question"]
+                      and "Choose three" not in q["question"]]
 
     def test_has_questions(self):
         self.assertGreater(len(self.data), 0)
@@ -202,24 +438,242 @@ class TestQuestionsJson(unittest.TestCase):
                 )
 
     def test_choose_two_have_two_answers(self):
-        choose_two = [q for q in self.data if "Choose two" in q["question"]]
-        self.assertGreater(len(choose_two), 0, "No 'Choose two' questions found")
-        for q in choose_two:
+        self.assertGreater(len(self.choose_two), 0, "No 'Choose two' questions found")
+        for q in self.choose_two:
             self.assertEqual(
                 len(q["correct_answer"]), 2,
                 f"Q{q['number']}: expected 2-letter answer, got '{q['correct_answer']}'"
             )
 
     def test_single_select_have_one_answer(self):
-        single = [q for q in self.data
-                   if "Choose two" not in q["question"]
-                   and "Choose three" not in q["question"]]
-        for q in single:
+        for q in self.single:
             self.assertEqual(
                 len(q["correct_answer"]), 1,
                 f"Q{q['number']}: expected 1-letter answer, got '{q['correct_answer']}'"
             )
 
 
+# ---------------------------------------------------------------------------
+# Web: background progress writer
+# ---------------------------------------------------------------------------
+class TestProgressWriter(unittest.TestCase):
+    def flush_with_timeout(self):
+        flusher = threading.Thread(target=web_quiz.flush_progress, daemon=True)
+        flusher.start()
+        flusher.join(timeout=5)
+        self.assertFalse(flusher.is_alive(), "flush_progress() hung")
+
+    def test_failing_write_does_not_hang_flush(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / ".x_progress.json")
+            bad = Progress()
+            bad.last_question_index = object()  # not JSON serializable
+            with self.assertLogs(web_quiz.app.logger, "ERROR"):
+                web_quiz._write_queue.put(("save", path, (bad, bad)))
+                self.flush_with_timeout()
+            # The writer thread survived and still performs later writes
+            web_quiz._write_queue.put(("append", path, "line\n"))
+            self.flush_with_timeout()
+            self.assertEqual(Path(delta_log_path(path)).read_text(), "line\n")
+
+
+# ---------------------------------------------------------------------------
+# Web: JSON quiz endpoints
+# ---------------------------------------------------------------------------
+class TestJsonEndpoints(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.progress_path = progress_path = Path(tmp.name) / ".saa-c03_progress.json"
+        files = patch.object(web_quiz, "files_for_cert",
+                             lambda cert_id: (Path(tmp.name) / "missing.json", progress_path))
+        files.start()
+        self.addCleanup(files.stop)
+        self.addCleanup(web_quiz.flush_progress)
+        self.client = web_quiz.app.test_client()
+
+    def start_quiz(self):
+        self.client.post("/cert/use-sample", data={"cert_id": "saa-c03"})
+        self.client.post("/quiz/start", data={"mode": "sequential"})
+
+    def test_404_without_active_quiz(self):
+        self.assertEqual(self.client.get("/quiz/question.json").status_code, 404)
+        r = self.client.post("/quiz/answer.json", data={"q_number": 1, "answer": "A"})
+        self.assertEqual(r.status_code, 404)
+        self.assertEqual(r.get_json(), {"error": "no quiz in progress"})
+
+    def test_question_then_answer_advances(self):
+        self.start_quiz()
+        r = self.client.get("/quiz/question.json")
+        self.assertEqual(r.status_code, 200)
+        data = r.get_json()
+        self.assertFalse(data["done"])
+        self.assertEqual(data["idx"], 0)
+        self.assertEqual(data["options"][0][0], "A")
+
+        r = self.client.post("/quiz/answer.json",
+                             data={"q_number": data["q_number"], "answer": ["Z"]})
+        self.assertEqual(r.status_code, 200)
+        result = r.get_json()
+        self.assertFalse(result["is_correct"])
+        self.assertEqual(result["user_answer"], ["Z"])
+        self.assertEqual(result["session_total"], 1)
+
+        r = self.client.get("/quiz/question.json")
+        self.assertEqual(r.get_json()["idx"], 1)
+
+    def test_concurrent_answers_are_all_counted(self):
+        clients = [web_quiz.app.test_client() for _ in range(8)]
+        for client in clients:
+            self.client = client
+            self.start_quiz()
+
+        def answer_many(client):
+            for _ in range(25):
+                client.post("/quiz/answer.json", data={"q_number": 1, "answer": "A"})
+
+        threads = [threading.Thread(target=answer_many, args=(c,)) for c in clients]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        web_quiz.flush_progress()
+        progress = web_quiz.app.config["PROGRESS_STORE"][str(self.progress_path)][1]
+        self.assertEqual(progress.questions_answered, 200)
+        self.assertEqual(progress.question_stats[1]["seen"], 200)
+        self.assertEqual(load_progress(str(self.progress_path)).questions_answered, 200)
+
+    def delta_lines(self):
+        web_quiz.flush_progress()
+        delta = Path(delta_log_path(str(self.progress_path)))
+        return len(delta.read_text().splitlines()) if delta.exists() else 0
+
+    def test_snapshot_counts_answers_from_every_session(self):
+        first, second = web_quiz.app.test_client(), web_quiz.app.test_client()
+        for client in (first, second):
+            self.client = client
+            self.start_quiz()
+        for _ in range(6):
+            for client in (first, second):
+                client.post("/quiz/answer.json", data={"q_number": 1, "answer": "A"})
+        # The 10th answer overall wrote a snapshot; only the two after it are logged
+        self.assertEqual(self.delta_lines(), 2)
+
+        # Any session finishing a quiz compacts the log, even one that never answered
+        idle = web_quiz.app.test_client()
+        self.client = idle
+        self.start_quiz()
+        idle.get("/quiz/complete")
+        self.assertEqual(self.delta_lines(), 0)
+        self.assertEqual(load_progress(str(self.progress_path)).questions_answered, 12)
+
+    def test_unknown_question_number(self):
+        self.start_quiz()
+        r = self.client.post("/quiz/answer.json", data={"q_number": 999999, "answer": "A"})
+        self.assertEqual(r.status_code, 404)
+        self.assertEqual(self.client.get("/quiz/question.json").get_json()["idx"], 0)
+
+
+# ---------------------------------------------------------------------------
+# Web: server-side sessions
+# ---------------------------------------------------------------------------
+class TestMemorySessions(unittest.TestCase):
+    def setUp(self):
+        self.sessions = web_quiz.MemorySessionInterface()
+        patcher = patch.object(web_quiz.app, "session_interface", self.sessions)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(web_quiz.flush_progress)
+        self.client = web_quiz.app.test_client()
+        self.client.post("/cert/use-sample", data={"cert_id": "saa-c03"})
+
+    def test_session_without_quiz_is_not_stored(self):
+        self.assertEqual(len(self.sessions.store), 0)
+        r = self.client.get("/menu")
+        self.assertEqual(r.status_code, 200)
+        self.assertIn("Cookie", r.vary)
+
+    def test_quiz_session_is_stored_and_expires(self):
+        self.client.post("/quiz/start", data={"mode": "sequential"})
+        self.assertEqual(len(self.sessions.store), 1)
+        r = self.client.get("/quiz")
+        self.assertEqual(r.status_code, 200)
+        self.assertIn("Cookie", r.vary)
+
+        idle = time.monotonic() + self.sessions.IDLE_TIMEOUT + 1
+        with patch.object(web_quiz.time, "monotonic", return_value=idle):
+            r = self.client.get("/quiz")
+        self.assertEqual(r.status_code, 302)
+        self.assertEqual(len(self.sessions.store), 0)
+
+
+# ---------------------------------------------------------------------------
+# Web: starting a quiz
+# ---------------------------------------------------------------------------
+class TestQuizStart(unittest.TestCase):
+    def test_advance_without_stored_position(self):
+        client = web_quiz.app.test_client()
+        client.post("/cert/use-sample", data={"cert_id": "saa-c03"})
+        client.post("/quiz/start", data={"mode": "sequential"})
+        with client.session_transaction() as sess:
+            del sess["quiz_pos"]
+        self.assertEqual(client.get("/quiz?advance=0").status_code, 200)
+        with client.session_transaction() as sess:
+            self.assertEqual(sess["quiz_pos"], 1)
+
+    def test_empty_bank_flashes_in_every_mode(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            questions_path = Path(tmp) / "empty_questions.json"
+            questions_path.write_text("[]")
+            client = web_quiz.app.test_client()
+            for mode in ("random", "sequential", "exam"):
+                with client.session_transaction() as sess:
+                    sess["cert_id"] = "saa-c03"
+                    sess["questions_file"] = str(questions_path)
+                r = client.post("/quiz/start", data={"mode": mode})
+                self.assertTrue(r.location.endswith("/menu"), mode)
+                with client.session_transaction() as sess:
+                    self.assertEqual(sess.get("flash_msg"),
+                                     "No questions available for that selection.")
+                    self.assertNotIn("order_seed", sess)
+
+
+# ---------------------------------------------------------------------------
+# Web: gzip negotiation
+# ---------------------------------------------------------------------------
+class TestGzipHtml(unittest.TestCase):
+    def setUp(self):
+        self.client = web_quiz.app.test_client()
+
+    def get_page(self, accept_encoding):
+        return self.client.get("/", headers={"Accept-Encoding": accept_encoding})
+
+    def test_gzip_when_accepted(self):
+        r = self.get_page("gzip, deflate")
+        self.assertEqual(r.headers.get("Content-Encoding"), "gzip")
+        self.assertIn("Accept-Encoding", r.vary)
+
+    def test_landing_page_compressed_once(self):
+        web_quiz._cert_picker_page["key"] = None
+        with patch.object(web_quiz.gzip, "compress", wraps=web_quiz.gzip.compress) as compress:
+            first = self.get_page("gzip")
+            second = self.get_page("gzip")
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(second.headers.get("Content-Encoding"), "gzip")
+        self.assertEqual(second.data, first.data)
+        html = web_quiz._cert_picker_page["page"][0]
+        self.assertEqual(web_quiz.gzip.decompress(second.data).decode(), html)
+
+    def test_zero_quality_means_no_gzip(self):
+        r = self.get_page("gzip;q=0, identity")
+        self.assertNotIn("Content-Encoding", r.headers)
+        self.assertIn(b"<html", r.data)
+
+    def test_vary_set_on_uncompressed_html(self):
+        r = self.get_page("identity")
+        self.assertNotIn("Content-Encoding", r.headers)
+        self.assertIn("Accept-Encoding", r.vary)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -5,45 +5,184 @@ Run with: python3 web_quiz.py [port]
 Then open http://localhost:5001 in your browser.
 """
 
+import atexit
+import copy
+import gzip
+import hashlib
 import json
 import os
+import queue
 import random
+import secrets
 import sys
+import threading
 import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from flask import Flask, session, redirect, url_for, request, render_template_string
+from typing import NamedTuple
+from flask import Flask, g, session, redirect, url_for, request, render_template, jsonify
+from flask.sessions import SecureCookieSession, SecureCookieSessionInterface
+from jinja2 import DictLoader, FileSystemBytecodeCache
+from markupsafe import Markup, escape
 
 # Reuse core logic from aws_quiz.py
 sys.path.insert(0, str(Path(__file__).parent))
 from aws_quiz import (
-    load_questions, load_progress, save_progress,
-    is_multi_select, get_domains, filter_by_domain,
-    get_weak_spots, Progress
+    load_questions, load_progress, save_progress, delta_line, append_delta,
+    build_domain_index, get_domains, filter_by_domain, get_domain_stats,
+    record_answer, Progress
 )
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("SECRET_KEY", "dev-only-change-in-production")
 
 SCRIPT_DIR = Path(__file__).parent
+GZIP_MIN_SIZE = 500  # bytes; smaller responses are not worth compressing
+SNAPSHOT_EVERY = 10  # answers between full progress saves; the rest go to the delta log
+
+# Static asset URLs carry a hash of the file's contents, so browsers can cache
+# them for a year and still pick up edits immediately.
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 365 * 24 * 3600
+# In-memory progress per progress file: {path: ((mtime_ns, size), Progress)}
+app.config["PROGRESS_STORE"] = {}
+# Answers in each progress file's delta log since its last full save: {path: count}
+app.config["UNSAVED_ANSWERS"] = {}
+app.jinja_env.globals["asset_version"] = {
+    name: hashlib.sha256((SCRIPT_DIR / "static" / name).read_bytes()).hexdigest()[:12]
+    for name in ("quiz.css", "quiz.js")
+}
+
 
-CERT_LIST = [
+class MemorySessionInterface(SecureCookieSessionInterface):
+    """Server-side sessions kept in process memory.
+
+    Once a session holds quiz state the cookie carries only a random session
+    id, so responses stop re-signing and re-sending the whole session on every
+    change. Before that (cert choice, flash messages) it stays in the usual
+    signed cookie, so clients that never start a quiz take no server memory.
+    Stored sessions do not survive a restart (progress is on disk anyway),
+    expire after IDLE_TIMEOUT seconds without a request, and the least
+    recently used ones are dropped past MAX_SESSIONS.
+    """
+    MAX_SESSIONS = 1000
+    IDLE_TIMEOUT = 2 * 60 * 60
+    QUIZ_KEYS = frozenset(("quiz_pos", "quiz_indices", "order_seed"))
+
+    def __init__(self):
+        self.store = OrderedDict()  # {sid: (last access, dict)}, oldest first
+        self.lock = threading.Lock()
+
+    def _prune(self, now):
+        """Drop expired and over-capacity sessions. Call with the lock held."""
+        while self.store:
+            sid, (seen, _) = next(iter(self.store.items()))
+            if now - seen <= self.IDLE_TIMEOUT and len(self.store) <= self.MAX_SESSIONS:
+                break
+            del self.store[sid]
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        now = time.monotonic()
+        with self.lock:
+            self._prune(now)
+            entry = self.store.get(sid) if sid else None
+            if entry is not None:
+                self.store[sid] = (now, entry[1])
+                self.store.move_to_end(sid)
+        if entry is None:
+            session = super().open_session(app, request)
+            session.sid = None
+            return session
+        session = SecureCookieSession(entry[1])
+        session.sid = sid
+        return session
+
+    def save_session(self, app, session, response):
+        if not self.QUIZ_KEYS.intersection(session):
+            if session.sid is not None:
+                with self.lock:
+                    self.store.pop(session.sid, None)
+                session.modified = True  # replace the id with a signed cookie
+            super().save_session(app, session, response)
+            return
+        if session.accessed:
+            response.vary.add("Cookie")
+        if not session.modified:
+            return
+        new_sid = session.sid is None
+        if new_sid:
+            session.sid = secrets.token_urlsafe(32)
+        with self.lock:
+            self.store[session.sid] = (time.monotonic(), dict(session))
+            self.store.move_to_end(session.sid)
+            self._prune(time.monotonic())
+        if new_sid:
+            response.set_cookie(
+                self.get_cookie_name(app), session.sid,
+                domain=self.get_cookie_domain(app),
+                path=self.get_cookie_path(app),
+                httponly=self.get_cookie_httponly(app),
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+
+
+app.session_interface = MemorySessionInterface()
+
+
+class Cert(NamedTuple):
+    id: str
+    name: str
+    tier: str
+    id_upper: str
+
+
+CERT_LIST = tuple(Cert(cert_id, name, tier, cert_id.upper()) for cert_id, name, tier in (
     # Foundational
-    {"id": "clf-c02", "name": "Cloud Practitioner",              "tier": "Foundational"},
+    ("clf-c02", "Cloud Practitioner",               "Foundational"),
     # Associate
-    {"id": "saa-c03", "name": "Solutions Architect Associate",   "tier": "Associate"},
-    {"id": "dva-c02", "name": "Developer Associate",             "tier": "Associate"},
-    {"id": "soa-c02", "name": "SysOps Administrator Associate",  "tier": "Associate"},
+    ("saa-c03", "Solutions Architect Associate",    "Associate"),
+    ("dva-c02", "Developer Associate",              "Associate"),
+    ("soa-c02", "SysOps Administrator Associate",   "Associate"),
     # Professional
-    {"id": "sap-c02", "name": "Solutions Architect Professional","tier": "Professional"},
-    {"id": "dop-c02", "name": "DevOps Engineer Professional",    "tier": "Professional"},
+    ("sap-c02", "Solutions Architect Professional", "Professional"),
+    ("dop-c02", "DevOps Engineer Professional",     "Professional"),
     # Specialty
-    {"id": "scs-c02", "name": "Security Specialty",              "tier": "Specialty"},
-    {"id": "ans-c01", "name": "Advanced Networking Specialty",   "tier": "Specialty"},
-    {"id": "mls-c01", "name": "Machine Learning Specialty",      "tier": "Specialty"},
-]
+    ("scs-c02", "Security Specialty",               "Specialty"),
+    ("ans-c01", "Advanced Networking Specialty",    "Specialty"),
+    ("mls-c01", "Machine Learning Specialty",       "Specialty"),
+))
+
+TIER_COLORS = {
+    "Foundational": "#4ade80",
+    "Associate":    "#60a5fa",
+    "Professional": "#ff9900",
+    "Specialty":    "#c084fc",
+}
+# (tier, color, certs) for every tier that has certs, in display order
+CERT_TIERS = tuple(
+    (tier, color, tuple(c for c in CERT_LIST if c.tier == tier))
+    for tier, color in TIER_COLORS.items()
+    if any(c.tier == tier for c in CERT_LIST)
+)
+
+# Question file of every listed cert, and a short-lived cache of which exist
+_CERT_FILENAMES = {c.id: f"{c.id}_questions.json" for c in CERT_LIST}
+CERT_CHECK_TTL = 10  # seconds
+_availability_cache = {"checked_at": float("-inf"), "available": {}}
+# Rendered landing page, plus its gzipped bytes (None if too small to
+# compress), and the set of available certs it was rendered for
+_cert_picker_page = {"key": None, "page": ("", None)}
+
+# Question banks keyed by file path: (mtime_ns, bank)
+_questions_cache: dict[str, tuple] = {}
 
 # ---------------------------------------------------------------------------
-# HTML templates (single-file, dark theme)
+# HTML templates (dark theme; styles live in static/quiz.css)
 # ---------------------------------------------------------------------------
 
 BASE_TEMPLATE = """<!DOCTYPE html>
@@ -52,226 +191,7 @@ BASE_TEMPLATE = """<!DOCTYPE html>
 <meta charset="UTF-8">
 <meta name="viewport" content="width=device-width, initial-scale=1.0">
 <title>AWS Quiz</title>
-<style>
-  :root {
-    --bg: #0f1117;
-    --surface: #1a1d27;
-    --surface2: #242736;
-    --border: #2e3245;
-    --text: #e2e8f0;
-    --muted: #8892a4;
-    --aws: #ff9900;
-    --aws-dim: #c47800;
-    --green: #4ade80;
-    --green-dim: #166534;
-    --red: #f87171;
-    --red-dim: #7f1d1d;
-    --blue: #60a5fa;
-    --yellow: #fbbf24;
-  }
-  *, *::before, *::after { box-sizing: border-box; margin: 0; padding: 0; }
-  body {
-    background: var(--bg);
-    color: var(--text);
-    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', system-ui, sans-serif;
-    font-size: 17px;
-    line-height: 1.6;
-    min-height: 100vh;
-  }
-  a { color: var(--aws); text-decoration: none; }
-  a:hover { text-decoration: underline; }
-
-  .container { max-width: 820px; margin: 0 auto; padding: 24px 20px; }
-
-  /* Header */
-  .header {
-    display: flex; align-items: center; gap: 12px;
-    padding: 16px 20px;
-    background: var(--surface);
-    border-bottom: 1px solid var(--border);
-    position: sticky; top: 0; z-index: 10;
-  }
-  .header-logo { font-size: 22px; font-weight: 700; color: var(--aws); }
-  .header-sub { color: var(--muted); font-size: 14px; }
-  .header-right { margin-left: auto; display: flex; gap: 12px; align-items: center; }
-  .header-stat { font-size: 13px; color: var(--muted); }
-  .header-stat span { color: var(--text); font-weight: 600; }
-
-  /* Cards */
-  .card {
-    background: var(--surface);
-    border: 1px solid var(--border);
-    border-radius: 12px;
-    padding: 24px;
-    margin-bottom: 20px;
-  }
-  .card-title {
-    font-size: 13px; font-weight: 600; letter-spacing: .08em;
-    text-transform: uppercase; color: var(--muted); margin-bottom: 16px;
-  }
-
-  /* Buttons */
-  .btn {
-    display: inline-flex; align-items: center; gap: 8px;
-    padding: 10px 20px; border-radius: 8px; border: 1px solid transparent;
-    font-size: 15px; font-weight: 500; cursor: pointer;
-    transition: opacity .15s, transform .1s;
-    text-decoration: none;
-  }
-  .btn:hover { opacity: .85; transform: translateY(-1px); text-decoration: none; }
-  .btn:active { transform: translateY(0); }
-  .btn-primary { background: var(--aws); color: #000; }
-  .btn-secondary { background: var(--surface2); color: var(--text); border-color: var(--border); }
-  .btn-danger { background: var(--red-dim); color: var(--red); border-color: var(--red-dim); }
-  .btn-sm { padding: 6px 14px; font-size: 13px; }
-
-  /* Menu grid */
-  .menu-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 12px; }
-  @media (max-width: 540px) { .menu-grid { grid-template-columns: 1fr; } }
-  .menu-grid > form { display: flex; }
-  .menu-grid > form > .menu-btn { flex: 1; }
-  .menu-btn {
-    background: var(--surface2); border: 1px solid var(--border);
-    border-radius: 10px; padding: 16px 20px; cursor: pointer;
-    text-align: left; color: var(--text); font-size: 15px;
-    transition: border-color .15s, background .15s;
-    text-decoration: none; display: block;
-  }
-  .menu-btn:hover { border-color: var(--aws); background: #1e2030; text-decoration: none; }
-  .menu-btn-icon { font-size: 22px; margin-bottom: 6px; }
-  .menu-btn-title { font-weight: 600; margin-bottom: 2px; }
-  .menu-btn-desc { font-size: 13px; color: var(--muted); }
-
-  /* Stats row */
-  .stats-row {
-    display: flex; gap: 16px; flex-wrap: wrap;
-    padding: 16px 20px;
-    background: var(--surface);
-    border-bottom: 1px solid var(--border);
-  }
-  .stat-box { text-align: center; }
-  .stat-value { font-size: 22px; font-weight: 700; color: var(--aws); }
-  .stat-label { font-size: 12px; color: var(--muted); }
-
-  /* Progress bar */
-  .progress-bar-wrap {
-    background: var(--surface2); border-radius: 99px; height: 6px;
-    overflow: hidden; margin-bottom: 20px;
-  }
-  .progress-bar-fill {
-    height: 100%; background: var(--aws); border-radius: 99px;
-    transition: width .4s ease;
-  }
-
-  /* Question */
-  .question-meta { display: flex; gap: 10px; align-items: center; margin-bottom: 12px; flex-wrap: wrap; }
-  .badge {
-    font-size: 12px; font-weight: 600; padding: 3px 10px;
-    border-radius: 99px; background: var(--surface2);
-    border: 1px solid var(--border); color: var(--muted);
-  }
-  .badge-aws { color: var(--aws); border-color: var(--aws-dim); }
-  .question-text { font-size: 18px; line-height: 1.7; margin-bottom: 24px; }
-
-  /* Options */
-  .options { display: flex; flex-direction: column; gap: 10px; margin-bottom: 24px; }
-  .option-label {
-    display: flex; align-items: flex-start; gap: 14px;
-    padding: 14px 18px; border-radius: 10px;
-    border: 2px solid var(--border); background: var(--surface2);
-    cursor: pointer; transition: border-color .15s, background .15s;
-    font-size: 16px; line-height: 1.5;
-  }
-  .option-label:hover { border-color: var(--aws); background: #1e2030; }
-  .option-label input[type=radio],
-  .option-label input[type=checkbox] { display: none; }
-  .option-label.selected { border-color: var(--aws); background: #1e1a0e; }
-  .option-key {
-    min-width: 28px; height: 28px; border-radius: 6px;
-    background: var(--surface); border: 1px solid var(--border);
-    display: flex; align-items: center; justify-content: center;
-    font-weight: 700; font-size: 14px; color: var(--aws); flex-shrink: 0;
-    margin-top: 1px;
-  }
-  .option-label.selected .option-key { background: var(--aws); color: #000; border-color: var(--aws); }
-
-  /* Result styles */
-  .result-banner {
-    border-radius: 10px; padding: 16px 20px; margin-bottom: 20px;
-    display: flex; align-items: center; gap: 12px; font-size: 18px; font-weight: 700;
-  }
-  .result-correct { background: var(--green-dim); color: var(--green); border: 1px solid #166534; }
-  .result-incorrect { background: var(--red-dim); color: var(--red); border: 1px solid #7f1d1d; }
-
-  .answer-list { display: flex; flex-direction: column; gap: 8px; margin: 12px 0; }
-  .answer-item {
-    display: flex; align-items: flex-start; gap: 12px;
-    padding: 12px 16px; border-radius: 8px;
-    font-size: 15px; line-height: 1.5;
-  }
-  .answer-correct { background: #052e16; border: 1px solid #166534; color: #bbf7d0; }
-  .answer-wrong   { background: #3b0000; border: 1px solid #7f1d1d; color: #fecaca; }
-  .answer-neutral { background: var(--surface2); border: 1px solid var(--border); }
-
-  .explanation-box {
-    background: #0d1b2e; border: 1px solid #1e3a5f;
-    border-radius: 10px; padding: 16px 20px; margin-top: 16px;
-  }
-  .explanation-title { font-size: 12px; font-weight: 700; letter-spacing: .08em;
-    text-transform: uppercase; color: var(--blue); margin-bottom: 8px; }
-  .explanation-text { color: #93c5fd; line-height: 1.7; font-size: 15px; }
-
-  /* Domain list */
-  .domain-list { display: flex; flex-direction: column; gap: 8px; }
-  .domain-item {
-    display: flex; align-items: center; justify-content: space-between;
-    padding: 12px 16px; background: var(--surface2);
-    border: 1px solid var(--border); border-radius: 8px;
-    cursor: pointer; text-decoration: none; color: var(--text);
-    transition: border-color .15s;
-  }
-  .domain-item:hover { border-color: var(--aws); text-decoration: none; }
-  .domain-count { font-size: 13px; color: var(--muted); }
-
-  /* Stats table */
-  .stats-table { width: 100%; border-collapse: collapse; }
-  .stats-table th, .stats-table td {
-    padding: 10px 14px; text-align: left;
-    border-bottom: 1px solid var(--border); font-size: 14px;
-  }
-  .stats-table th { color: var(--muted); font-size: 12px; text-transform: uppercase; letter-spacing: .07em; }
-  .mini-bar-wrap { background: var(--surface2); border-radius: 99px; height: 4px; width: 80px; display: inline-block; vertical-align: middle; margin-left: 8px; }
-  .mini-bar-fill { height: 100%; background: var(--aws); border-radius: 99px; }
-
-  /* Flash messages */
-  .flash { padding: 12px 16px; border-radius: 8px; margin-bottom: 16px; font-size: 14px; }
-  .flash-info { background: #0d1b2e; border: 1px solid #1e3a5f; color: var(--blue); }
-
-  /* Cert picker */
-  .cert-grid { display: grid; grid-template-columns: repeat(2, 1fr); gap: 12px; }
-  @media (max-width: 540px) { .cert-grid { grid-template-columns: 1fr; } }
-  .cert-card {
-    width: 100%; background: var(--surface);
-    border: 2px solid var(--border); border-radius: 12px;
-    padding: 20px 24px; cursor: pointer; text-align: left;
-    transition: border-color .15s, background .15s; color: var(--text);
-  }
-  .cert-card:hover { border-color: var(--aws); background: #1e2030; }
-  .cert-card.cert-available { border-color: var(--green-dim); }
-  .cert-card.cert-available:hover { border-color: var(--green); }
-  .cert-card-id { font-size: 18px; font-weight: 700; color: var(--aws); margin-bottom: 4px; }
-  .cert-card-name { font-size: 14px; color: var(--muted); margin-bottom: 8px; }
-  .cert-card-status { font-size: 12px; }
-  .cert-card.cert-available .cert-card-status { color: var(--green); }
-  .cert-card:not(.cert-available) .cert-card-status { color: var(--muted); }
-
-  /* Responsive */
-  @media (max-width: 540px) {
-    .header { flex-wrap: wrap; }
-    .question-text { font-size: 16px; }
-    .option-label { font-size: 15px; padding: 12px 14px; }
-  }
-</style>
+<link rel="stylesheet" href="{{ url_for('static', filename='quiz.css', v=asset_version['quiz.css']) }}">
 </head>
 <body>
 <div class="header">
@@ -298,49 +218,39 @@ BASE_TEMPLATE = """<!DOCTYPE html>
 </html>
 """
 
-CERT_PICKER_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
+CERT_PICKER_TEMPLATE = """{% extends "base.html" %}
 {% block body %}
 <div class="container" style="margin-top:40px">
   <h1 style="color:var(--aws);margin-bottom:8px">AWS Certification Quiz</h1>
   <p style="color:var(--muted);margin-bottom:32px">Select a certification to get started.</p>
 
-  {% set tiers = ["Foundational", "Associate", "Professional", "Specialty"] %}
-  {% set tier_colors = {
-    "Foundational": "#4ade80",
-    "Associate":    "#60a5fa",
-    "Professional": "#ff9900",
-    "Specialty":    "#c084fc"
-  } %}
-  {% for tier in tiers %}
-  {% set color = tier_colors[tier] %}
-  {% set tier_certs = certs | selectattr("tier", "equalto", tier) | list %}
-  {% if tier_certs %}
+  {% for tier, color, tier_certs in cert_tiers %}
   <div style="margin-bottom:28px">
     <div style="font-size:12px;font-weight:700;letter-spacing:.1em;text-transform:uppercase;
                 color:{{ color }};margin-bottom:12px;padding-bottom:6px;
                 border-bottom:1px solid {{ color }}40">{{ tier }}</div>
     <div class="cert-grid">
       {% for cert in tier_certs %}
+      {% set is_available = available[cert.id] %}
       <form method="post" action="/cert/select" style="display:contents">
         <input type="hidden" name="cert_id" value="{{ cert.id }}">
-        <button type="submit" class="cert-card{% if cert.available %} cert-available{% endif %}"
+        <button type="submit" class="cert-card{% if is_available %} cert-available{% endif %}"
                 style="border-color:{{ color }}40">
-          <div class="cert-card-id" style="color:{{ color }}">{{ cert.id | upper }}</div>
+          <div class="cert-card-id" style="color:{{ color }}">{{ cert.id_upper }}</div>
           <div class="cert-card-name">{{ cert.name }}</div>
           <div class="cert-card-status">
-            {% if cert.available %}Questions available{% else %}No questions yet{% endif %}
+            {% if is_available %}Questions available{% else %}No questions yet{% endif %}
           </div>
         </button>
       </form>
       {% endfor %}
     </div>
   </div>
-  {% endif %}
   {% endfor %}
 </div>
-{% endblock %}""")
+{% endblock %}"""
 
-CERT_NOT_FOUND_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
+CERT_NOT_FOUND_TEMPLATE = """{% extends "base.html" %}
 {% block body %}
 <div class="container" style="margin-top:40px;max-width:600px">
   <div style="font-size:48px;margin-bottom:16px">&#128269;</div>
@@ -372,9 +282,9 @@ CERT_NOT_FOUND_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}"
 
   <a href="/" class="btn btn-secondary">&#8592; Back to Cert Picker</a>
 </div>
-{% endblock %}""")
+{% endblock %}"""
 
-MENU_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
+MENU_TEMPLATE = """{% extends "base.html" %}
 {% block body %}
 <div class="container">
   {% if flash_msg %}
@@ -454,9 +364,9 @@ MENU_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
     </form>
   </div>
 </div>
-{% endblock %}""")
+{% endblock %}"""
 
-DOMAIN_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
+DOMAIN_TEMPLATE = """{% extends "base.html" %}
 {% block body %}
 <div class="container" style="margin-top:24px">
   <h2 style="margin-bottom:16px">Filter by Domain</h2>
@@ -482,9 +392,9 @@ DOMAIN_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
   </div>
   <div style="margin-top:16px"><a href="/menu" class="btn btn-secondary">&#8592; Back</a></div>
 </div>
-{% endblock %}""")
+{% endblock %}"""
 
-QUESTION_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
+QUESTION_TEMPLATE = """{% extends "base.html" %}
 {% block body %}
 <div class="progress-bar-wrap" style="border-radius:0;margin-bottom:0;height:4px">
   <div class="progress-bar-fill" style="width:{{ progress_pct }}%"></div>
@@ -505,20 +415,11 @@ QUESTION_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
 
   <div class="question-text">{{ question_text }}</div>
 
-  <form method="post" action="/quiz/answer" id="quiz-form">
+  <form method="post" action="/quiz/answer" id="quiz-form" data-multi="{{ multi }}"
+        {%- if exam_end %} data-exam-end="{{ exam_end }}"{% endif %}>
     <input type="hidden" name="q_number" value="{{ q_number }}">
     <div class="options">
-      {% for letter, text in options %}
-      <label class="option-label" id="opt-{{ letter }}">
-        {% if multi > 1 %}
-        <input type="checkbox" name="answer" value="{{ letter }}" onchange="updateSelected(this)">
-        {% else %}
-        <input type="radio" name="answer" value="{{ letter }}" onchange="autoSubmit()">
-        {% endif %}
-        <span class="option-key">{{ letter }}</span>
-        <span>{{ text }}</span>
-      </label>
-      {% endfor %}
+      {{ option_rows }}
     </div>
     {% if multi > 1 %}
     <button type="submit" class="btn btn-primary" id="submit-btn" disabled>Submit {{ multi }} Answers</button>
@@ -526,56 +427,15 @@ QUESTION_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
   </form>
 
   <div style="margin-top:20px;display:flex;gap:10px">
-    <a href="/quiz/skip" class="btn btn-secondary btn-sm">Skip</a>
+    <a href="/quiz?advance={{ idx }}" class="btn btn-secondary btn-sm">Skip</a>
     <a href="/menu" class="btn btn-secondary btn-sm">&#x1F3E0; Menu</a>
   </div>
 </div>
 
-<script>
-{% if multi > 1 %}
-function updateSelected(el) {
-  var checked = document.querySelectorAll('input[type=checkbox]:checked');
-  document.querySelectorAll('.option-label').forEach(function(l) {
-    var cb = l.querySelector('input[type=checkbox]');
-    l.classList.toggle('selected', cb && cb.checked);
-  });
-  var btn = document.getElementById('submit-btn');
-  btn.disabled = (checked.length !== {{ multi }});
-  btn.textContent = checked.length < {{ multi }}
-    ? 'Select ' + ({{ multi }} - checked.length) + ' more'
-    : 'Submit {{ multi }} Answers';
-}
-{% else %}
-function autoSubmit() {
-  document.querySelectorAll('.option-label').forEach(function(l) {
-    var r = l.querySelector('input[type=radio]');
-    l.classList.toggle('selected', r && r.checked);
-  });
-  setTimeout(function(){ document.getElementById('quiz-form').submit(); }, 180);
-}
-{% endif %}
-{% if exam_end %}
-(function() {
-  var endMs = {{ exam_end }} * 1000;
-  var badge = document.getElementById('exam-timer');
-  function tick() {
-    var rem = Math.max(0, Math.round((endMs - Date.now()) / 1000));
-    var m = Math.floor(rem / 60), s = rem % 60;
-    badge.textContent = m + ':' + (s < 10 ? '0' : '') + s;
-    if (rem <= 300) {
-      badge.style.color = 'var(--red)';
-      badge.style.borderColor = 'var(--red-dim)';
-    }
-    if (rem <= 0) { window.location.href = '/quiz/complete'; return; }
-    setTimeout(tick, 1000);
-  }
-  tick();
-})();
-{% endif %}
-</script>
-{% endblock %}""")
-
-RESULT_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
+<script src="{{ url_for('static', filename='quiz.js', v=asset_version['quiz.js']) }}" defer></script>
+{% endblock %}"""
+
+RESULT_TEMPLATE = """{% extends "base.html" %}
 {% block body %}
 <div class="progress-bar-wrap" style="border-radius:0;margin-bottom:0;height:4px">
   <div class="progress-bar-fill" style="width:{{ progress_pct }}%"></div>
@@ -612,13 +472,13 @@ RESULT_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
   </div>
 
   <div style="display:flex;gap:10px">
-    <a href="/quiz/next" class="btn btn-primary">Next Question &#8594;</a>
+    <a href="/quiz?advance={{ idx }}" class="btn btn-primary">Next Question &#8594;</a>
     <a href="/menu" class="btn btn-secondary">&#x1F3E0; Menu</a>
   </div>
 </div>
-{% endblock %}""")
+{% endblock %}"""
 
-COMPLETE_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
+COMPLETE_TEMPLATE = """{% extends "base.html" %}
 {% block body %}
 <div class="container" style="margin-top:40px;text-align:center">
   <div style="font-size:48px;margin-bottom:16px">&#127881;</div>
@@ -631,9 +491,9 @@ COMPLETE_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
   </div>
   <a href="/menu" class="btn btn-primary">Back to Menu</a>
 </div>
-{% endblock %}""")
+{% endblock %}"""
 
-EXAM_COMPLETE_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
+EXAM_COMPLETE_TEMPLATE = """{% extends "base.html" %}
 {% block body %}
 <div class="container" style="margin-top:40px;text-align:center">
   <div class="result-banner {{ 'result-correct' if passed else 'result-incorrect' }}"
@@ -662,9 +522,9 @@ EXAM_COMPLETE_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}",
   </p>
   <a href="/menu" class="btn btn-primary">Back to Menu</a>
 </div>
-{% endblock %}""")
+{% endblock %}"""
 
-STATS_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
+STATS_TEMPLATE = """{% extends "base.html" %}
 {% block body %}
 <div class="container" style="margin-top:24px">
   <h2 style="margin-bottom:20px">Statistics</h2>
@@ -684,17 +544,7 @@ STATS_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
     <table class="stats-table">
       <thead><tr><th>Domain</th><th>Attempted</th><th>Correct</th><th>Accuracy</th></tr></thead>
       <tbody>
-        {% for row in domain_stats %}
-        <tr>
-          <td>{{ row.domain }}</td>
-          <td>{{ row.attempted }}/{{ row.total }}</td>
-          <td>{{ row.correct }}</td>
-          <td>
-            {{ row.pct }}%
-            <span class="mini-bar-wrap"><span class="mini-bar-fill" style="width:{{ row.pct }}%"></span></span>
-          </td>
-        </tr>
-        {% endfor %}
+        {{ domain_rows }}
       </tbody>
     </table>
   </div>
@@ -705,13 +555,41 @@ STATS_TEMPLATE = BASE_TEMPLATE.replace("{% block body %}{% endblock %}", """
 
   <div style="margin-top:16px"><a href="/menu" class="btn btn-secondary">&#8592; Back</a></div>
 </div>
-{% endblock %}""")
+{% endblock %}"""
+
+
+# Templates are string constants in this module, so there is nothing to
+# re-check per render; compiled bytecode is kept on disk across restarts.
+app.config["TEMPLATES_AUTO_RELOAD"] = False
+app.jinja_env.auto_reload = False
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
+# Drop the newline after each block tag and the indentation before it, so
+# the template's own layout does not end up in every response.
+app.jinja_env.trim_blocks = True
+app.jinja_env.lstrip_blocks = True
+
+# Pages extend one shared base. The environment compiles and caches each
+# template the first time it is rendered.
+app.jinja_env.loader = DictLoader({
+    "base.html": BASE_TEMPLATE,
+    "cert_picker.html": CERT_PICKER_TEMPLATE,
+    "cert_not_found.html": CERT_NOT_FOUND_TEMPLATE,
+    "menu.html": MENU_TEMPLATE,
+    "domain.html": DOMAIN_TEMPLATE,
+    "question.html": QUESTION_TEMPLATE,
+    "result.html": RESULT_TEMPLATE,
+    "complete.html": COMPLETE_TEMPLATE,
+    "exam_complete.html": EXAM_COMPLETE_TEMPLATE,
+    "stats.html": STATS_TEMPLATE,
+})
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=64)
 def files_for_cert(cert_id: str):
     """Return (questions_path, progress_path) for a given cert ID."""
     questions_path = SCRIPT_DIR / f"{cert_id}_questions.json"
@@ -719,45 +597,385 @@ def files_for_cert(cert_id: str):
     return questions_path, progress_path
 
 
-def get_progress_ctx(progress: Progress, questions: list) -> dict:
+_OPTION_ROW = ('<label class="option-label" id="opt-{letter}">'
+               '<input type="{kind}" name="answer" value="{letter}">'
+               '<span class="option-key">{letter}</span>'
+               '<span>{text}</span></label>\n')
+
+
+_STATS_ROW = ('<tr><td>{domain}</td><td>{attempted}/{total}</td><td>{correct}</td>'
+              '<td>{pct}% <span class="mini-bar-wrap"><span class="mini-bar-fill" '
+              'style="width:{pct}%"></span></span></td></tr>\n')
+
+
+def stats_rows_html(domain_stats: list) -> Markup:
+    """Pre-escaped <tr> rows for the per-domain stats table."""
+    return Markup("".join(
+        _STATS_ROW.format(domain=escape(row["domain"]), attempted=row["attempted"],
+                          total=row["total"], correct=row["correct"], pct=row["pct"])
+        for row in domain_stats))
+
+
+@lru_cache(maxsize=256)
+def option_rows_html(options: tuple, multi: bool) -> Markup:
+    """Pre-escaped answer inputs for the question page, one label per option."""
+    kind = "checkbox" if multi else "radio"
+    return Markup("".join(
+        _OPTION_ROW.format(letter=escape(letter), kind=kind, text=escape(text))
+        for letter, text in options))
+
+
+def get_progress_ctx(progress: Progress) -> dict:
     """Build common template context vars for header stats."""
-    s_pct = round(progress.current_session_correct / progress.current_session_total * 100
-                  if progress.current_session_total > 0 else 0)
-    o_pct = round(progress.correct_answers / progress.questions_answered * 100
-                  if progress.questions_answered > 0 else 0)
-    cert_id = session.get("cert_id", "")
+    return dict(_header_ctx(
+        g.cert_id,
+        progress.current_session_correct, progress.current_session_total,
+        progress.correct_answers, progress.questions_answered,
+    ))
+
+
+@lru_cache(maxsize=32)
+def _header_ctx(cert_id: str, session_correct: int, session_total: int,
+                overall_correct: int, overall_total: int) -> dict:
+    # Cached on the counters themselves; get_progress_ctx hands out copies
+    # because routes add their own keys to the result.
+    s_pct = round(session_correct / session_total * 100 if session_total > 0 else 0)
+    o_pct = round(overall_correct / overall_total * 100 if overall_total > 0 else 0)
     return dict(
         cert_name=cert_id.upper(),
-        session_correct=progress.current_session_correct,
-        session_total=progress.current_session_total,
+        session_correct=session_correct,
+        session_total=session_total,
         session_pct=s_pct,
-        overall_correct=progress.correct_answers,
-        overall_total=progress.questions_answered,
+        overall_correct=overall_correct,
+        overall_total=overall_total,
         overall_pct=o_pct,
     )
 
 
+def cert_availability() -> dict:
+    """Map each listed cert ID to whether its question file exists.
+
+    One directory listing answers it for every cert, and the answer is reused
+    for CERT_CHECK_TTL seconds.
+    """
+    now = time.monotonic()
+    if now - _availability_cache["checked_at"] > CERT_CHECK_TTL:
+        with os.scandir(SCRIPT_DIR) as entries:
+            present = {entry.name for entry in entries}
+        _availability_cache["available"] = {
+            cert_id: filename in present for cert_id, filename in _CERT_FILENAMES.items()}
+        _availability_cache["checked_at"] = now
+    return _availability_cache["available"]
+
+
+@dataclass(slots=True)
+class QuestionBank:
+    """A cert's parsed questions plus the domain lookups built from them."""
+    questions: list
+    domain_index: dict = field(init=False)
+    domain_counts: list = field(init=False)  # [(domain, n_questions)], sorted
+    by_number: dict = field(init=False)  # {question number: Question}
+    number_list: tuple = field(init=False)  # question numbers in file order
+    position: dict = field(init=False)  # {question number: index in number_list}
+    numbers: frozenset = field(init=False)
+
+    def __post_init__(self):
+        self.by_number = {q.number: q for q in self.questions}
+        self.number_list = tuple(q.number for q in self.questions)
+        self.position = {n: i for i, n in enumerate(self.number_list)}
+        self.numbers = frozenset(self.by_number)
+        self.domain_index = build_domain_index(self.questions)
+        self.domain_counts = [(d, len(self.domain_index[d]))
+                              for d in get_domains(self.domain_index)]
+
+
+def load_question_bank(questions_path: Path) -> QuestionBank:
+    """Return the question bank for a file, rebuilding it only when it changes.
+
+    The bank is shared between requests, so callers must not mutate it.
+    """
+    key = str(questions_path)
+    mtime = questions_path.stat().st_mtime_ns
+    cached = _questions_cache.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    bank = QuestionBank(load_questions(key))
+    _questions_cache[key] = (mtime, bank)
+    return bank
+
+
+def _file_stamp(path: Path):
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def get_progress(progress_path: Path) -> Progress:
+    """Return the progress for a cert from the in-memory store.
+
+    The file is only parsed when it changed behind our back (e.g. the CLI quiz
+    was run in between); our own writes go through put_progress, which keeps
+    the stored stamp current. The object is also kept on flask.g so repeated
+    lookups within one request are free.
+    """
+    if "progress" in g:
+        return g.progress
+    key = str(progress_path)
+    store = app.config["PROGRESS_STORE"]
+    with _store_lock:
+        stamp = _file_stamp(progress_path)
+        cached = store.get(key)
+        if cached and cached[0] == stamp:
+            progress = cached[1]
+        else:
+            # Also covers a missing file: answers may still be in the delta log
+            progress = load_progress(key)
+            store[key] = (stamp, progress)
+    g.progress = progress
+    return progress
+
+
+def put_progress(progress: Progress, progress_path: Path) -> None:
+    """Queue a full save of progress and make it the current stored copy.
+
+    The writer thread gets a snapshot, so later answers can keep updating
+    the live object while the save is pending.
+    """
+    key = str(progress_path)
+    # Copy and queue under the lock, so the snapshot holds exactly the answers
+    # whose log lines were queued before it.
+    with _store_lock:
+        snapshot = copy.copy(progress)
+        snapshot.question_stats = {n: s.copy() for n, s in progress.question_stats.items()}
+        app.config["PROGRESS_STORE"][key] = (_file_stamp(progress_path), progress)
+        app.config["UNSAVED_ANSWERS"][key] = 0
+        _write_queue.put(("save", key, (snapshot, progress)))
+    g.progress = progress
+
+
+def log_answer(progress: Progress, number: int, is_correct: bool) -> None:
+    """Persist an answer already applied with record_answer().
+
+    Call with _store_lock held, together with record_answer(), so no other
+    request's snapshot can slip in between the update and its write. Most
+    answers append one line to the delta log; every SNAPSHOT_EVERY-th
+    answer to the file, from any session, rewrites the full progress file
+    instead, which clears the log.
+    """
+    key = str(g.progress_path)
+    unsaved = app.config["UNSAVED_ANSWERS"]
+    if unsaved.get(key, 0) + 1 >= SNAPSHOT_EVERY:
+        put_progress(progress, g.progress_path)  # resets the count
+    else:
+        unsaved[key] = unsaved.get(key, 0) + 1
+        progress.last_session = datetime.now().isoformat()
+        _write_queue.put(("append", key, delta_line(progress, number, is_correct)))
+
+
+def _progress_writer():
+    """Perform queued progress writes, in order, off the request path.
+
+    Whatever is queued is taken in one batch. A full save makes every earlier
+    write to the same file redundant, so only the last one per file runs,
+    followed by any log lines queued after it.
+    """
+    while True:
+        jobs = [_write_queue.get()]
+        while True:
+            try:
+                jobs.append(_write_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            _run_write_jobs(jobs)
+        finally:
+            # Always, so flush_progress() can't block on a batch that failed
+            for _ in jobs:
+                _write_queue.task_done()
+
+
+def _run_write_jobs(jobs: list) -> None:
+    last_save = {key: i for i, (kind, key, _) in enumerate(jobs) if kind == "save"}
+    for i, (kind, key, payload) in enumerate(jobs):
+        if i < last_save.get(key, -1):
+            continue
+        # One bad job must not take the writer thread down with it
+        try:
+            if kind == "save":
+                _write_snapshot(key, *payload)
+            else:
+                append_delta(key, payload)
+        except Exception:
+            app.logger.exception("Could not write progress to %s", key)
+
+
+def _write_snapshot(key: str, snapshot: Progress, live: Progress) -> None:
+    # Under the store lock, so get_progress never sees our own new stamp
+    # before the store does and mistakes it for an outside change.
+    with _store_lock:
+        save_progress(snapshot, key)
+        live.last_session = snapshot.last_session
+        store = app.config["PROGRESS_STORE"]
+        cached = store.get(key)
+        if cached and cached[1] is live:
+            store[key] = (_file_stamp(Path(key)), live)
+
+
+def flush_progress() -> None:
+    """Block until every queued progress write has reached the disk."""
+    _write_queue.join()
+
+
+_store_lock = threading.RLock()  # re-entered by put_progress from log_answer
+_write_queue = queue.Queue()  # ("save", path, (snapshot, live)) or ("append", path, line)
+threading.Thread(target=_progress_writer, name="progress-writer", daemon=True).start()
+atexit.register(flush_progress)
+
+
 def load_all():
-    """Load questions and progress for the cert in the current session."""
-    cert_id = session.get("cert_id", "")
-    if not cert_id:
+    """Load the question bank and progress for the cert in the current session."""
+    if not g.cert_id:
         return None, None
-    questions_path, progress_path = files_for_cert(cert_id)
-    # Allow sample file override stored in session
-    questions_override = session.get("questions_file")
-    if questions_override:
-        questions_path = Path(questions_override)
     try:
-        questions = load_questions(str(questions_path))
+        bank = load_question_bank(g.questions_path)
     except Exception:
         return None, None
-    progress = load_progress(str(progress_path))
-    return questions, progress
+    progress = get_progress(g.progress_path)
+    return bank, progress
+
+
+@lru_cache(maxsize=8)
+def _seeded_order(seed: int, n: int) -> tuple:
+    """A random permutation of range(n) that is fixed for a given seed."""
+    return tuple(random.Random(seed).sample(range(n), n))
+
+
+def quiz_active() -> bool:
+    """True if the session has a quiz in progress."""
+    return "order_seed" in session or "quiz_indices" in session
+
+
+def quiz_length(bank: QuestionBank) -> int:
+    """Number of questions in the session's quiz."""
+    if "order_seed" in session:
+        return len(bank.questions)
+    return len(session["quiz_indices"])
+
+
+def quiz_question_at(bank: QuestionBank, pos: int):
+    """The question asked at position pos of the session's quiz, or None."""
+    seed = session.get("order_seed")
+    if seed is not None:
+        return bank.questions[_seeded_order(seed, len(bank.questions))[pos]]
+    return bank.by_number.get(session["quiz_indices"][pos])
+
+
+def grade_answer(q, raw_answers: list):
+    """Return (is_correct, set of picked letters) for a submitted answer."""
+    if q.expected_answers > 1:
+        user_answer_set = set(raw_answers)
+        return user_answer_set == q.correct_set, user_answer_set
+    user_answer_set = set(raw_answers[:1])
+    is_correct = raw_answers[0] == q.correct_answer if raw_answers else False
+    return is_correct, user_answer_set
+
+
+def current_step(bank: QuestionBank):
+    """(pos, total, question) for the session's quiz.
+
+    The question is None once pos is past the end, or if the bank no longer
+    has that question.
+    """
+    total = quiz_length(bank)
+    pos = session.get("quiz_pos", 0)
+    return pos, total, quiz_question_at(bank, pos) if pos < total else None
+
+
+def question_fields(q, pos: int, total: int) -> dict:
+    """Question details shared by the question page and its JSON variant."""
+    return dict(
+        q_number=q.number,
+        question_text=q.text,
+        domain=q.domain,
+        multi=q.expected_answers,
+        idx=pos,
+        total=total,
+        progress_pct=round(pos / total * 100),
+        exam_end=session.get("exam_end"),
+    )
+
+
+def exam_time_up() -> bool:
+    """True if the session is in a timed exam whose time has run out."""
+    exam_end = session.get("exam_end")
+    return bool(exam_end) and time.time() > exam_end
+
+
+def submit_answer(bank: QuestionBank, progress: Progress):
+    """Grade, record and persist the posted answer.
+
+    Returns (question, is_correct, picked letters, quiz position), or None if
+    the posted question number is not in the bank.
+    """
+    q = bank.by_number.get(request.form.get("q_number", 0, type=int))
+    if not q:
+        return None
+    is_correct, user_answer_set = grade_answer(q, request.form.getlist("answer"))
+    pos = session.get("quiz_pos", 0)
+    # The progress object is shared by every request for this cert
+    with _store_lock:
+        record_answer(progress, q.number, is_correct, pos)
+        log_answer(progress, q.number, is_correct)
+    return q, is_correct, user_answer_set, pos
+
+
+@app.before_request
+def resolve_cert_files():
+    """Look up the session's cert and its file paths once per request."""
+    if request.endpoint == "static":
+        return
+    g.cert_id = session.get("cert_id", "")
+    g.questions_path, g.progress_path = files_for_cert(g.cert_id)
+    # Allow sample file override stored in session
+    questions_override = session.get("questions_file")
+    if questions_override:
+        g.questions_path = Path(questions_override)
+
+
+@app.after_request
+def gzip_html(response):
+    """Gzip rendered pages for clients that accept it.
+
+    The pages repeat the same markup for every option and domain row, so they
+    compress to a fraction of their size. Static files are streamed and left
+    as they are.
+    """
+    if (response.status_code != 200 or response.direct_passthrough
+            or response.mimetype != "text/html"
+            or "Content-Encoding" in response.headers):
+        return response
+    # Caches must key on Accept-Encoding whichever way this goes.
+    response.vary.add("Accept-Encoding")
+    if not request.accept_encodings["gzip"]:  # absent or gzip;q=0
+        return response
+    # Pre-rendered pages bring their compressed body along in g.gzipped_body
+    compressed = g.get("gzipped_body")
+    if compressed is None:
+        data = response.get_data()
+        if len(data) < GZIP_MIN_SIZE:
+            return response
+        compressed = gzip.compress(data, compresslevel=6)
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = "gzip"
+    return response
 
 
 def _require_cert():
-    """Return cert_id from session, or None to signal a redirect is needed."""
-    return session.get("cert_id")
+    """Return cert_id from session, or '' to signal a redirect is needed."""
+    return g.cert_id
 
 
 # ---------------------------------------------------------------------------
@@ -766,11 +984,20 @@ def _require_cert():
 
 @app.route("/")
 def cert_picker():
-    certs = []
-    for c in CERT_LIST:
-        questions_path, _ = files_for_cert(c["id"])
-        certs.append({**c, "available": questions_path.exists()})
-    return render_template_string(CERT_PICKER_TEMPLATE, certs=certs, hide_menu_btn=True)
+    # The page only depends on which question files exist, so it is rendered
+    # once per availability state and then served as is.
+    available = cert_availability()
+    key = frozenset(cert_id for cert_id, ok in available.items() if ok)
+    if _cert_picker_page["key"] != key:
+        html = render_template(
+            "cert_picker.html", cert_tiers=CERT_TIERS, available=available,
+            hide_menu_btn=True)
+        data = html.encode()
+        _cert_picker_page["page"] = (
+            html, gzip.compress(data, compresslevel=6) if len(data) >= GZIP_MIN_SIZE else None)
+        _cert_picker_page["key"] = key
+    html, g.gzipped_body = _cert_picker_page["page"]
+    return html
 
 
 @app.route("/cert/select", methods=["POST"])
@@ -784,8 +1011,8 @@ def cert_select():
         session.pop("questions_file", None)
         return redirect(url_for("menu"))
     sample_path = SCRIPT_DIR / f"{cert_id}_questions.sample.json"
-    return render_template_string(
-        CERT_NOT_FOUND_TEMPLATE,
+    return render_template(
+        "cert_not_found.html",
         cert_id=cert_id,
         cert_name=cert_id.upper(),
         has_sample=sample_path.exists(),
@@ -808,13 +1035,14 @@ def cert_use_sample():
 def menu():
     if not _require_cert():
         return redirect(url_for("cert_picker"))
-    questions, progress = load_all()
-    if questions is None:
+    bank, progress = load_all()
+    if bank is None:
         return redirect(url_for("cert_picker"))
-    weak = len(get_weak_spots(questions, progress))
+    questions = bank.questions
+    weak = len(progress.weak_numbers & bank.numbers)
     pct = round(progress.correct_answers / progress.questions_answered * 100
                 if progress.questions_answered > 0 else 0)
-    ctx = get_progress_ctx(progress, questions)
+    ctx = get_progress_ctx(progress)
     ctx.update(
         total_q=len(questions),
         answered=progress.questions_answered,
@@ -824,72 +1052,79 @@ def menu():
         last_idx=progress.last_question_index,
         flash_msg=session.pop("flash_msg", None),
     )
-    return render_template_string(MENU_TEMPLATE, **ctx)
+    return render_template("menu.html", **ctx)
 
 
 @app.route("/domain")
 def domain_page():
     if not _require_cert():
         return redirect(url_for("cert_picker"))
-    questions, progress = load_all()
-    if questions is None:
+    bank, progress = load_all()
+    if bank is None:
         return redirect(url_for("cert_picker"))
-    domains = get_domains(questions)
-    domain_list = [(d, len([q for q in questions if d in q.domain])) for d in domains]
-    ctx = get_progress_ctx(progress, questions)
-    ctx.update(domains=domain_list, total_q=len(questions))
-    return render_template_string(DOMAIN_TEMPLATE, **ctx)
+    questions = bank.questions
+    ctx = get_progress_ctx(progress)
+    ctx.update(domains=bank.domain_counts, total_q=len(questions))
+    return render_template("domain.html", **ctx)
 
 
 @app.route("/quiz/start", methods=["POST"])
 def quiz_start():
     if not _require_cert():
         return redirect(url_for("cert_picker"))
-    questions, progress = load_all()
-    if questions is None:
+    bank, progress = load_all()
+    if bank is None:
         return redirect(url_for("cert_picker"))
+    questions = bank.questions
     mode = request.form.get("mode", "random")
     domain = request.form.get("domain", "all")
 
-    _, progress_path = files_for_cert(session["cert_id"])
-
-    # Reset session quiz state
-    progress.current_session_correct = 0
-    progress.current_session_total = 0
-    save_progress(progress, str(progress_path))
+    # Reset session quiz state. Only the in-memory copy changes here; the
+    # first answer's save writes it out along with that answer.
+    with _store_lock:
+        progress.current_session_correct = 0
+        progress.current_session_total = 0
 
     # Clear any previous exam timer
     session.pop("exam_end", None)
 
+    session.pop("order_seed", None)
+    session.pop("quiz_indices", None)
+
     if mode == "random":
-        q_list = questions.copy()
-        random.shuffle(q_list)
-    elif mode == "sequential":
-        q_list = questions.copy()
+        numbers = bank.number_list  # shuffled on demand from order_seed
     elif mode == "resume":
-        idx = progress.last_question_index
-        q_list = questions[idx:]
+        numbers = bank.number_list[progress.last_question_index:]
     elif mode == "weak":
-        q_list = get_weak_spots(questions, progress)
+        # Same order as get_weak_spots (worst accuracy first, ties in file
+        # order), but only the weak questions are visited.
+        stats = progress.question_stats
+        numbers = sorted(progress.weak_numbers & bank.numbers,
+                         key=lambda n: (stats[n]["correct"] / stats[n]["seen"], bank.position[n]))
     elif mode == "domain":
-        q_list = filter_by_domain(questions, domain)
-        if not q_list:
+        numbers = [q.number for q in filter_by_domain(questions, bank.domain_index, domain)]
+        if not numbers:
             session["flash_msg"] = f"No questions found for domain: {domain}"
             return redirect(url_for("menu"))
-        random.shuffle(q_list)
+        random.shuffle(numbers)
     elif mode == "exam":
-        pool = questions.copy()
-        random.shuffle(pool)
-        q_list = pool[:65]
+        numbers = random.sample(bank.number_list, min(65, len(bank.number_list)))
         session["exam_end"] = time.time() + 130 * 60
-    else:
-        q_list = questions.copy()
+    else:  # sequential
+        numbers = bank.number_list
 
-    if not q_list:
+    if not numbers:
         session["flash_msg"] = "No questions available for that selection."
         return redirect(url_for("menu"))
 
-    session["quiz_indices"] = [q.number for q in q_list]
+    if mode == "random":
+        # Only the seed goes in the session; the order is rebuilt on demand.
+        session["order_seed"] = random.getrandbits(64)
+    else:
+        # Sessions live in server memory, so pack per-quiz orders as 4-byte
+        # ints rather than a list of int objects; the bank's own tuple is
+        # just shared.
+        session["quiz_indices"] = numbers if numbers is bank.number_list else array("i", numbers)
     session["quiz_pos"] = 0
     session["last_result"] = None
     return redirect(url_for("quiz_question"))
@@ -897,115 +1132,69 @@ def quiz_start():
 
 @app.route("/quiz")
 def quiz_question():
-    if not _require_cert() or "quiz_indices" not in session:
+    if not _require_cert() or not quiz_active():
         return redirect(url_for("cert_picker"))
 
-    questions, progress = load_all()
-    if questions is None:
+    bank, progress = load_all()
+    if bank is None:
         return redirect(url_for("cert_picker"))
-    q_map = {q.number: q for q in questions}
 
-    indices = session["quiz_indices"]
+    # Next/Skip links carry the position they leave, so reloading the page
+    # does not advance a second time.
     pos = session.get("quiz_pos", 0)
+    if request.args.get("advance", type=int) == pos:
+        session["quiz_pos"] = pos + 1
 
-    if pos >= len(indices):
+    pos, total, q = current_step(bank)
+    if pos >= total:
         return redirect(url_for("quiz_complete"))
-
-    q = q_map.get(indices[pos])
     if not q:
         return redirect(url_for("menu"))
 
-    multi = is_multi_select(q)
-    progress_pct = round(pos / len(indices) * 100)
-    ctx = get_progress_ctx(progress, questions)
-    ctx.update(
-        q_number=q.number,
-        question_text=q.text,
-        options=sorted(q.options.items()),
-        domain=q.domain,
-        multi=multi,
-        idx=pos,
-        total=len(indices),
-        progress_pct=progress_pct,
-        exam_end=session.get("exam_end"),
-    )
-    return render_template_string(QUESTION_TEMPLATE, **ctx)
+    ctx = get_progress_ctx(progress)
+    ctx.update(question_fields(q, pos, total),
+               option_rows=option_rows_html(q.options_sorted, q.expected_answers > 1))
+    return render_template("question.html", **ctx)
 
 
 @app.route("/quiz/answer", methods=["POST"])
 def quiz_answer():
-    if not _require_cert() or "quiz_indices" not in session:
+    if not _require_cert() or not quiz_active():
         return redirect(url_for("cert_picker"))
 
-    if session.get("exam_end") and time.time() > session["exam_end"]:
+    if exam_time_up():
         return redirect(url_for("quiz_complete"))
 
-    questions, progress = load_all()
-    if questions is None:
+    bank, progress = load_all()
+    if bank is None:
         return redirect(url_for("cert_picker"))
-    q_map = {q.number: q for q in questions}
 
-    q_number = int(request.form.get("q_number", 0))
-    q = q_map.get(q_number)
-    if not q:
+    answered = submit_answer(bank, progress)
+    if not answered:
         return redirect(url_for("menu"))
+    q, is_correct, user_answer_set, pos = answered
 
-    raw_answers = request.form.getlist("answer")
-    multi = is_multi_select(q)
-
-    if multi > 1:
-        user_answer_set = set(raw_answers)
-        is_correct = user_answer_set == set(q.correct_answer)
-    else:
-        user_answer_set = set(raw_answers[:1])
-        is_correct = raw_answers[0] == q.correct_answer if raw_answers else False
-
-    # Update progress
-    q_key = str(q.number)
-    if q_key not in progress.question_stats:
-        progress.question_stats[q_key] = {"seen": 0, "correct": 0}
-    progress.question_stats[q_key]["seen"] += 1
-    progress.current_session_total += 1
-    progress.questions_answered += 1
-    progress.last_question_index = session.get("quiz_pos", 0)
-
-    if is_correct:
-        progress.question_stats[q_key]["correct"] += 1
-        progress.current_session_correct += 1
-        progress.correct_answers += 1
-
-    _, progress_path = files_for_cert(session["cert_id"])
-    save_progress(progress, str(progress_path))
-
-    # Determine correct set
-    if multi > 1:
-        correct_set = set(q.correct_answer)
-    else:
-        correct_set = {q.correct_answer}
-
-    pos = session.get("quiz_pos", 0)
-    indices = session["quiz_indices"]
-    progress_pct = round(pos / len(indices) * 100)
-
-    ctx = get_progress_ctx(progress, questions)
+    total = quiz_length(bank)
+    ctx = get_progress_ctx(progress)
     ctx.update(
         q_number=q.number,
         question_text=q.text,
-        options=sorted(q.options.items()),
+        options=q.options_sorted,
         is_correct=is_correct,
         user_set=user_answer_set,
-        correct_set=correct_set,
+        correct_set=q.correct_set,
         explanation=q.explanation,
         idx=pos,
-        total=len(indices),
-        progress_pct=progress_pct,
+        total=total,
+        progress_pct=round(pos / total * 100),
     )
-    return render_template_string(RESULT_TEMPLATE, **ctx)
+    return render_template("result.html", **ctx)
 
 
+# The pages link to /quiz?advance=<pos> now; these stay for old links.
 @app.route("/quiz/next")
 def quiz_next():
-    if "quiz_indices" not in session:
+    if not quiz_active():
         return redirect(url_for("menu"))
     session["quiz_pos"] = session.get("quiz_pos", 0) + 1
     return redirect(url_for("quiz_question"))
@@ -1013,85 +1202,124 @@ def quiz_next():
 
 @app.route("/quiz/skip")
 def quiz_skip():
-    if "quiz_indices" not in session:
+    if not quiz_active():
         return redirect(url_for("menu"))
     session["quiz_pos"] = session.get("quiz_pos", 0) + 1
     return redirect(url_for("quiz_question"))
 
 
+# JSON variants of the quiz pages, for clients that update the page in place
+# instead of loading a full HTML page per question.
+
+@app.route("/quiz/question.json")
+def quiz_question_json():
+    if not _require_cert() or not quiz_active():
+        return jsonify(error="no quiz in progress"), 404
+    bank, progress = load_all()
+    if bank is None:
+        return jsonify(error="question file not found"), 404
+
+    pos, total, q = current_step(bank)
+    if pos >= total:
+        return jsonify(done=True, idx=pos, total=total)
+    if not q:
+        return jsonify(error="question not found"), 404
+    return jsonify(done=False, options=q.options_sorted, **question_fields(q, pos, total))
+
+
+@app.route("/quiz/answer.json", methods=["POST"])
+def quiz_answer_json():
+    """Grade and record an answer, then move on to the next question."""
+    if not _require_cert() or not quiz_active():
+        return jsonify(error="no quiz in progress"), 404
+    if exam_time_up():
+        return jsonify(error="exam time is up"), 409
+    bank, progress = load_all()
+    if bank is None:
+        return jsonify(error="question file not found"), 404
+
+    answered = submit_answer(bank, progress)
+    if not answered:
+        return jsonify(error="question not found"), 404
+    q, is_correct, user_answer_set, pos = answered
+    session["quiz_pos"] = pos + 1
+
+    return jsonify(
+        q_number=q.number,
+        is_correct=is_correct,
+        user_answer=sorted(user_answer_set),
+        correct_answer=sorted(q.correct_set),
+        explanation=q.explanation,
+        session_correct=progress.current_session_correct,
+        session_total=progress.current_session_total,
+    )
+
+
 @app.route("/quiz/complete")
 def quiz_complete():
     if not _require_cert():
         return redirect(url_for("cert_picker"))
-    questions, progress = load_all()
-    if questions is None:
-        return redirect(url_for("cert_picker"))
-
+    # Only the progress counters are shown, so the question bank isn't needed
+    progress = get_progress(g.progress_path)
+    with _store_lock:
+        if app.config["UNSAVED_ANSWERS"].get(str(g.progress_path)):
+            put_progress(progress, g.progress_path)
+    flush_progress()
+
+    # The header context already carries session_correct/total and their pct
+    ctx = get_progress_ctx(progress)
+    pct = ctx["session_pct"]
     exam_end = session.pop("exam_end", None)
     if exam_end:
         exam_start = exam_end - 130 * 60
         time_used_s = min(130 * 60, time.time() - exam_start)
         used_m, used_s = int(time_used_s // 60), int(time_used_s % 60)
-        pct = round(progress.current_session_correct / progress.current_session_total * 100
-                    if progress.current_session_total > 0 else 0)
-        ctx = get_progress_ctx(progress, questions)
         ctx.update(
-            session_correct=progress.current_session_correct,
-            session_total=progress.current_session_total,
             pct=pct,
             passed=pct >= 72,
             time_used=f"{used_m}:{used_s:02d}",
         )
-        return render_template_string(EXAM_COMPLETE_TEMPLATE, **ctx)
+        return render_template("exam_complete.html", **ctx)
 
-    pct = round(progress.current_session_correct / progress.current_session_total * 100
-                if progress.current_session_total > 0 else 0)
-    ctx = get_progress_ctx(progress, questions)
-    ctx.update(
-        session_correct=progress.current_session_correct,
-        session_total=progress.current_session_total,
-        pct=pct,
-    )
-    return render_template_string(COMPLETE_TEMPLATE, **ctx)
+    ctx.update(pct=pct)
+    return render_template("complete.html", **ctx)
 
 
 @app.route("/stats")
 def stats():
     if not _require_cert():
         return redirect(url_for("cert_picker"))
-    questions, progress = load_all()
-    if questions is None:
+    bank, progress = load_all()
+    if bank is None:
         return redirect(url_for("cert_picker"))
-    domains = get_domains(questions)
-    domain_stats = []
-    for domain in domains:
-        dqs = [q for q in questions if domain in q.domain]
-        attempted = sum(1 for q in dqs if str(q.number) in progress.question_stats)
-        correct = sum(progress.question_stats.get(str(q.number), {}).get("correct", 0) for q in dqs)
-        pct = round(correct / attempted * 100 if attempted > 0 else 0)
-        domain_stats.append(dict(domain=domain, total=len(dqs),
-                                 attempted=attempted, correct=correct, pct=pct))
+    questions = bank.questions
+    domain_stats = [
+        dict(counts, domain=domain,
+             pct=round(counts["correct"] / counts["attempted"] * 100
+                       if counts["attempted"] > 0 else 0))
+        for domain, counts in get_domain_stats(questions, progress).items()
+    ]
 
     overall_pct = round(progress.correct_answers / progress.questions_answered * 100
                         if progress.questions_answered > 0 else 0)
-    ctx = get_progress_ctx(progress, questions)
+    ctx = get_progress_ctx(progress)
     ctx.update(
         total_q=len(questions),
         answered=progress.questions_answered,
         correct=progress.correct_answers,
         pct=overall_pct,
-        domain_stats=domain_stats,
+        domain_rows=stats_rows_html(domain_stats),
         last_session=progress.last_session,
     )
-    return render_template_string(STATS_TEMPLATE, **ctx)
+    return render_template("stats.html", **ctx)
 
 
 @app.route("/reset", methods=["POST"])
 def reset():
-    cert_id = session.get("cert_id", "")
-    _, progress_path = files_for_cert(cert_id)
+    cert_id = g.cert_id
     progress = Progress()
-    save_progress(progress, str(progress_path))
+    put_progress(progress, g.progress_path)
+    flush_progress()
     session.clear()
     session["cert_id"] = cert_id
     session["flash_msg"] = "Progress has been reset."
@@ -1106,4 +1334,4 @@ if __name__ == "__main__":
     port = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
     print(f"Starting AWS Quiz web server at http://localhost:{port}")
     print("Press Ctrl+C to stop.")
-    app.run(debug=False, port=port)
+    app.run(debug=False, port=port, threaded=True)
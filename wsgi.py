@@ -0,0 +1,11 @@
+"""WSGI entry point for running the web quiz under a production server.
+
+Run a single worker process: sessions, the progress store and the progress
+writer thread all live in that process. Use threads for concurrency, e.g.
+
+    gunicorn --workers 1 --threads 8 --bind 0.0.0.0:5001 wsgi:app
+"""
+
+from web_quiz import app
+
+__all__ = ["app"]